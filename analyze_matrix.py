@@ -3,11 +3,157 @@ Script per analizzare i collegamenti tra minifigure e set LEGO
 """
 import sqlite3
 import json
+import gzip
+from collections import defaultdict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Minifig -> set connections resolved inside SQLite. Comma-separated
+# ``sets`` values are split by the recursive CTE and matched exactly on
+# the trimmed item; other values fall back to a substring match against
+# every known set code.
+CONNECTIONS_QUERY = """
+    WITH RECURSIVE split(minifig_code, item, rest) AS (
+        SELECT minifig_code, NULL, sets || ','
+        FROM minifig
+        WHERE instr(sets, ',') > 0
+        UNION ALL
+        SELECT minifig_code,
+               trim(substr(rest, 1, instr(rest, ',') - 1), char(32, 9, 10, 13)),
+               substr(rest, instr(rest, ',') + 1)
+        FROM split
+        WHERE rest != ''
+    )
+    SELECT split.minifig_code, lego_sets.lego_code
+    FROM split
+    JOIN lego_sets ON lego_sets.lego_code = split.item
+    UNION ALL
+    SELECT minifig.minifig_code, lego_sets.lego_code
+    FROM minifig
+    JOIN lego_sets ON instr(minifig.sets, lego_sets.lego_code) > 0
+    WHERE instr(minifig.sets, ',') = 0
+    ORDER BY 1, 2
+"""
+
+# Read-only connection shared by every analyze_connections() call
+_CONN = None
+
+def _get_conn():
+    """Open the read-only database connection on first use and reuse it afterwards"""
+    global _CONN
+    if _CONN is None:
+        # Read-only analytics: open without write locks and tune for large scans
+        _CONN = sqlite3.connect(
+            'file:lego_database/LegoDatabase.db?mode=ro&cache=shared',
+            uri=True, check_same_thread=False
+        )
+        _CONN.execute("PRAGMA query_only = ON")
+        _CONN.execute("PRAGMA cache_size = -65536")  # 64MB cache
+        _CONN.execute("PRAGMA temp_store = MEMORY")
+        _CONN.execute("PRAGMA mmap_size = 268435456")  # 256MB memory map
+    return _CONN
+
+def build_csr_adjacency(matrix_data):
+    """Build the minifig x set adjacency matrix in CSR form.
+
+    Row ``i`` is ``matrix_data['minifigs'][i]``; its connected sets are
+    ``col_indices[row_ptr[i]:row_ptr[i + 1]]``, as positions in
+    ``matrix_data['sets']``.
+    """
+    minifig_index = {m['code']: i for i, m in enumerate(matrix_data['minifigs'])}
+    set_index = {s['code']: i for i, s in enumerate(matrix_data['sets'])}
+    connections = matrix_data['connections']
+    
+    # Count connections per row, then turn the counts into row offsets
+    row_ptr = [0] * (len(minifig_index) + 1)
+    for connection in connections:
+        row_ptr[minifig_index[connection['minifig_code']] + 1] += 1
+    for i in range(len(minifig_index)):
+        row_ptr[i + 1] += row_ptr[i]
+    
+    # Place each column index in its row slot
+    col_indices = [0] * len(connections)
+    next_slot = row_ptr[:-1]
+    for connection in connections:
+        row = minifig_index[connection['minifig_code']]
+        col_indices[next_slot[row]] = set_index[connection['set_code']]
+        next_slot[row] += 1
+    
+    return {'row_ptr': row_ptr, 'col_indices': col_indices}
+
+def count_by_theme(matrix_data):
+    """Count sets and distinct connected minifigs per theme.
+
+    Codes are mapped to integer ids so the grouping runs on NumPy arrays
+    instead of per-theme Python lists and sets. Themes are returned in
+    order of first appearance in ``matrix_data['sets']``.
+    """
+    if np is None:
+        return _count_by_theme_python(matrix_data)
+    
+    sets = matrix_data['sets']
+    connections = matrix_data['connections']
+    theme_id = {}
+    theme_of_set = np.fromiter(
+        (theme_id.setdefault(s['theme'], len(theme_id)) for s in sets),
+        dtype=np.int32, count=len(sets)
+    )
+    set_id = {s['code']: i for i, s in enumerate(sets)}
+    mf_id = {m['code']: i for i, m in enumerate(matrix_data['minifigs'])}
+    rows = np.fromiter((mf_id[c['minifig_code']] for c in connections), dtype=np.int32, count=len(connections))
+    cols = np.fromiter((set_id[c['set_code']] for c in connections), dtype=np.int32, count=len(connections))
+    
+    sets_per_theme = np.bincount(theme_of_set, minlength=len(theme_id))
+    # Unique (theme, minifig) pairs, so a minifig in several sets of a theme counts once
+    theme_minifig_pairs = np.unique(np.stack([theme_of_set[cols], rows]), axis=1)
+    minifigs_per_theme = np.bincount(theme_minifig_pairs[0], minlength=len(theme_id))
+    
+    return [
+        (theme, int(sets_per_theme[i]), int(minifigs_per_theme[i]))
+        for theme, i in theme_id.items()
+    ]
+
+def _count_by_theme_python(matrix_data):
+    """Pure-Python count_by_theme, used when NumPy is not installed"""
+    set_to_theme = {s['code']: s['theme'] for s in matrix_data['sets']}
+    theme_sets = defaultdict(int)
+    theme_minifigs = defaultdict(set)
+    for set_item in matrix_data['sets']:
+        theme_sets[set_item['theme']] += 1
+    for connection in matrix_data['connections']:
+        theme_minifigs[set_to_theme[connection['set_code']]].add(connection['minifig_code'])
+    return [(theme, count, len(theme_minifigs[theme])) for theme, count in theme_sets.items()]
+
+def save_matrix_parquet(matrix_data, output_dir='lego_database'):
+    """Save sets, minifigs and connections as zstd-compressed Parquet tables"""
+    if pa is None:
+        print("pyarrow not installed: skipping Parquet export")
+        return []
+    
+    paths = []
+    for name in ('sets', 'minifigs', 'connections'):
+        path = f"{output_dir}/matrix_{name}.parquet"
+        pq.write_table(pa.Table.from_pylist(matrix_data[name]), path, compression='zstd')
+        paths.append(path)
+    return paths
 
 def analyze_connections():
     """Analizza i collegamenti tra minifigure e set basati sui dati"""
-    conn = sqlite3.connect('lego_database/LegoDatabase.db')
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
     
     # Get all sets with themes
     cursor.execute('SELECT lego_code, official_name, theme FROM lego_sets ORDER BY lego_code')
@@ -41,63 +187,51 @@ def analyze_connections():
             'theme': set_theme or 'Unknown'
         })
     
-    # Add minifigs data and create connections
+    # Add minifigs data
     for minifig_code, minifig_name, minifig_sets in minifigs:
         matrix_data['minifigs'].append({
             'code': minifig_code,
             'name': minifig_name,
             'sets': minifig_sets or ''
         })
-        
-        # Parse the sets field to create connections
-        if minifig_sets:
-            # Try to extract set codes from the sets field
-            # This might be comma-separated or other format
-            set_codes = []
-            if ',' in minifig_sets:
-                set_codes = [s.strip() for s in minifig_sets.split(',')]
-            else:
-                # Try to match against known set codes
-                for set_code, _, _ in sets:
-                    if set_code in minifig_sets:
-                        set_codes.append(set_code)
-            
-            # Create connections
-            for set_code in set_codes:
-                # Verify the set exists
-                if any(s[0] == set_code for s in sets):
-                    matrix_data['connections'].append({
-                        'minifig_code': minifig_code,
-                        'set_code': set_code
-                    })
+    
+    # Create connections with a single join in SQLite
+    cursor.execute(CONNECTIONS_QUERY)
+    matrix_data['connections'] = [
+        {'minifig_code': minifig_code, 'set_code': set_code}
+        for minifig_code, set_code in cursor
+    ]
     
     print(f"\n=== MATRIX SUMMARY ===")
     print(f"Total connections: {len(matrix_data['connections'])}")
     
-    # Group by theme
-    themes = {}
-    for set_item in matrix_data['sets']:
-        theme = set_item['theme']
-        if theme not in themes:
-            themes[theme] = {'sets': [], 'minifigs': set()}
-        themes[theme]['sets'].append(set_item['code'])
-        
-        # Add minifigs for this theme
-        for conn in matrix_data['connections']:
-            if conn['set_code'] == set_item['code']:
-                themes[theme]['minifigs'].add(conn['minifig_code'])
-    
     print(f"\n=== CONNECTIONS BY THEME ===")
-    for theme, data in themes.items():
-        print(f"- {theme}: {len(data['sets'])} sets, {len(data['minifigs'])} minifigs")
+    for theme, set_count, minifig_count in count_by_theme(matrix_data):
+        print(f"- {theme}: {set_count} sets, {minifig_count} minifigs")
+    
+    # Save matrix data for the web page, with connections as CSR arrays
+    web_data = {
+        'sets': matrix_data['sets'],
+        'minifigs': matrix_data['minifigs'],
+        'adjacency': build_csr_adjacency(matrix_data)
+    }
+    # Compact output (no indentation) plus a pre-gzipped copy for the web server
+    if orjson is not None:
+        payload = orjson.dumps(web_data, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(web_data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    with open('lego_database/matrix_data.json', 'wb') as f:
+        f.write(payload)
+    with gzip.open('lego_database/matrix_data.json.gz', 'wb', compresslevel=6) as f:
+        f.write(payload)
     
-    # Save matrix data for the web page
-    with open('lego_database/matrix_data.json', 'w', encoding='utf-8') as f:
-        json.dump(matrix_data, f, ensure_ascii=False, indent=2)
+    print("Matrix data saved to: lego_database/matrix_data.json (+ .gz)")
     
-    print("Matrix data saved to: lego_database/matrix_data.json")
+    # Columnar copy for downstream analysis tools
+    for path in save_matrix_parquet(matrix_data):
+        print(f"Matrix table saved to: {path}")
     
-    conn.close()
+    cursor.close()
     return matrix_data
 
 if __name__ == "__main__":
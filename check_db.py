@@ -1,20 +1,22 @@
 import sqlite3
 
-conn = sqlite3.connect('lego_database/LegoDatabase.db')
+# Read-only inspection: open without write locks and tune for scans
+conn = sqlite3.connect('file:lego_database/LegoDatabase.db?mode=ro', uri=True, isolation_level=None)
+conn.execute("PRAGMA query_only = ON")  # no implicit transactions or write locks
+conn.execute("PRAGMA cache_size = -65536")  # 64MB cache
+conn.execute("PRAGMA temp_store = MEMORY")
+conn.execute("PRAGMA mmap_size = 268435456")  # 256MB memory map
 cursor = conn.cursor()
 
-# Get all tables
-cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-tables = cursor.fetchall()
-print("Tables in database:", [t[0] for t in tables])
+# Get all tables (names are needed twice: for the summary and the loop)
+table_names = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+print("Tables in database:", table_names)
 
-# Get column info for each table
-for table in tables:
-    table_name = table[0]
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    columns = cursor.fetchall()
+# Get column info for each table, streaming rows from the cursor
+for table_name in table_names:
+    cursor.execute("SELECT name, type FROM pragma_table_info(?)", (table_name,))
     print(f"\nTable {table_name} columns:")
-    for col in columns:
-        print(f"  - {col[1]} ({col[2]})")
+    for col_name, col_type in cursor:
+        print(f"  - {col_name} ({col_type})")
 
 conn.close()
@@ -2,34 +2,40 @@
 Configuration settings for the LEGO BrickEconomy Scraper
 """
 import os
-from typing import List
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Tuple
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Load environment variables: the .env next to this file is used directly, without
+# find_dotenv() walking the call stack and parent directories; otherwise fall back to the search
+_ENV_PATH = Path(__file__).resolve().with_name(".env")
+load_dotenv(_ENV_PATH if _ENV_PATH.is_file() else None)
 
+@dataclass(frozen=True)
 class Config:
-    """Configuration class for the scraper"""
+    """Configuration for the scraper (immutable; override fields via the constructor)"""
     
     # BrickEconomy website settings
-    BASE_URL = "https://www.brickeconomy.com/"
-    LOGIN_URL = "https://www.brickeconomy.com/"
+    BASE_URL: str = "https://www.brickeconomy.com/"
+    LOGIN_URL: str = "https://www.brickeconomy.com/"
     
     # User credentials (loaded from environment)
-    USERNAME = os.getenv("BRICKECONOMY_USERNAME", "")
-    PASSWORD = os.getenv("BRICKECONOMY_PASSWORD", "")
+    USERNAME: str = os.getenv("BRICKECONOMY_USERNAME", "")
+    PASSWORD: str = os.getenv("BRICKECONOMY_PASSWORD", "")
     
     # Selenium settings
-    HEADLESS = os.getenv("CHROME_HEADLESS", "false").lower() == "true"
-    WAIT_TIME = 10
-    SCRAPING_DELAY = int(os.getenv("SCRAPING_DELAY", "2"))
+    HEADLESS: bool = os.getenv("CHROME_HEADLESS", "false").lower() == "true"
+    WAIT_TIME: float = 10
+    SCRAPING_DELAY: int = int(os.getenv("SCRAPING_DELAY", "2"))
+    CHROMEDRIVER_PATH: str = os.getenv("CHROMEDRIVER_PATH", "")  # empty: resolved by webdriver-manager
     
     # Output settings
-    OUTPUT_FORMAT = os.getenv("OUTPUT_FORMAT", "xlsx")
-    OUTPUT_DIRECTORY = "output"
+    OUTPUT_FORMAT: str = os.getenv("OUTPUT_FORMAT", "xlsx")
+    OUTPUT_DIRECTORY: str = "output"
     
     # Target themes to filter results
-    TARGET_THEMES: List[str] = [
+    TARGET_THEMES: Tuple[str, ...] = (
         "The Lord of the Rings",
         "Harry Potter", 
         "Icons",
@@ -37,7 +43,7 @@ class Config:
         "BrickHeadz",
         "Dimensions",
         "The Hobbit"
-    ]
+    )
     
     # XPath selectors
     class XPaths:
@@ -56,7 +62,11 @@ class Config:
         
     @classmethod
     def validate(cls):
-        """Validate configuration settings"""
+        """Validate configuration settings
+        
+        Checks the class defaults loaded from the environment, not credentials
+        passed to an instance's constructor.
+        """
         errors = []
         
         if not cls.USERNAME:
@@ -4,22 +4,59 @@ Provides optimized database operations with indexing, validation, and backup
 """
 
 import sqlite3
-import pandas as pd
+import csv
 import shutil
+import subprocess
+import atexit
 import json
 import re
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union, Tuple
-from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Union, Tuple, Iterable
+from contextlib import contextmanager, ExitStack
 import threading
+from itertools import groupby
+from operator import itemgetter
 from dataclasses import dataclass
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from exceptions import DatabaseError, DataValidationError
 from logging_system import get_logger
 
 logger = get_logger(__name__)
 
+# Patterns used by the _extract_* helpers, compiled once
+_NUM_RE = re.compile(r'\d+')
+_PRICE_CLEAN_RE = re.compile(r'[£€$,\s]')
+_PRICE_NUM_RE = re.compile(r'\d+\.?\d*')
+_YEAR_RE = re.compile(r'\b(?:19|20)\d{2}\b')
+
+# Placeholder values the scraper stores when a field could not be read
+_MISSING_VALUES = frozenset((None, '', 'Not found', 'Error'))
+_FAILED_NAMES = frozenset((None, 'Not found', 'Error'))
+
+# SQL twin of _FAILED_NAMES: 1 when the row's official name was scraped
+_SCRAPE_SUCCESS_SQL = "({name} IS NOT NULL AND {name} NOT IN ('Not found', 'Error'))"
+
+# Formats accepted by export_to_formats
+_EXPORT_FORMATS = frozenset(('csv', 'json', 'xlsx'))
+
+# Fields scored for completeness, and all set fields read by validation
+_SET_SCORE_FIELDS = (
+    'official_name', 'number_of_pieces', 'released', 'theme',
+    'retail_price_eur', 'retail_price_gbp', 'image_path'
+)
+_MINIFIG_SCORE_FIELDS = (
+    'official_name', 'year', 'theme', 'retail_price_gbp', 'image_path'
+)
+_SET_SOURCE_FIELDS = _SET_SCORE_FIELDS + (
+    'number_of_minifigs', 'value_new_sealed', 'value_used'
+)
+
 
 @dataclass
 class DatabaseStats:
@@ -36,13 +73,23 @@ class DatabaseStats:
     last_updated: str = "Never"
 
 
+def dump_json(records: List[Dict[str, Any]]) -> bytes:
+    """Serialize export records as indented JSON, with orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(records, option=orjson.OPT_INDENT_2)
+    return json.dumps(records, ensure_ascii=False, indent=2).encode('utf-8')
+
+
 class DatabaseManager:
     """Enhanced database manager with optimization and validation"""
     
     def __init__(self, db_path: str = "lego_database/LegoDatabase.db"):
         self.db_path = Path(db_path)
         self.backup_dir = self.db_path.parent / "backups"
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()  # guards the single writer connection
+        self._writer: Optional[sqlite3.Connection] = None
+        self._local = threading.local()  # one read-only connection per thread
+        self._readers: List[sqlite3.Connection] = []
         
         # Ensure directories exist
         self.db_path.parent.mkdir(exist_ok=True)
@@ -50,10 +97,22 @@ class DatabaseManager:
         
         # Initialize database
         self._initialize_database()
+        
+        # Writable columns of the actual table schema; the UPSERT statements built
+        # from them are cached per set of supplied columns
+        with self._get_reader() as conn:
+            self._set_columns = self._table_columns(conn, 'lego_sets')
+            self._minifig_columns = self._table_columns(conn, 'minifig')
+        self._upsert_statements: Dict[Tuple[str, Tuple[str, ...]], str] = {}
         logger.info(f"Database manager initialized: {self.db_path}")
     
     def _initialize_database(self):
         """Initialize database with optimized schema"""
+        # Open the writer with the layout settings before any table is created
+        with self._lock:
+            if self._writer is None:
+                self._writer = self._connect(layout=True)
+        
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
@@ -88,7 +147,10 @@ class DatabaseManager:
                     image_path TEXT,
                     theme TEXT,
                     subtheme TEXT,
-                    has_image INTEGER DEFAULT 0,
+                    -- Derivato da image_path: non va mai scritto dal chiamante
+                    has_image INTEGER GENERATED ALWAYS AS (
+                        image_path IS NOT NULL AND image_path NOT IN ('', 'Not found', 'Error')
+                    ) VIRTUAL,
                     
                     -- Enhanced numeric fields
                     pieces_numeric INTEGER,
@@ -120,8 +182,10 @@ class DatabaseManager:
                     year TEXT,
                     released TEXT,
                     retail_price_gbp TEXT,
-                    has_image INTEGER DEFAULT 0,
                     image_path TEXT,
+                    has_image INTEGER GENERATED ALWAYS AS (
+                        image_path IS NOT NULL AND image_path NOT IN ('', 'Not found', 'Error')
+                    ) VIRTUAL,
                     sets TEXT,
                     theme TEXT,
                     
@@ -164,9 +228,18 @@ class DatabaseManager:
                 )
             """)
             
+            # Stored success flag read by the stats, kept in step with official_name
+            self._ensure_scrape_success(cursor, 'lego_sets', 'lego_code')
+            self._ensure_scrape_success(cursor, 'minifig', 'minifig_code')
+            
             # Create indexes for performance
             self._create_indexes(cursor)
             
+            # Gather planner statistics on first run so the indexes get used
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                cursor.execute("ANALYZE")
+            
             # Insert initial metadata
             cursor.execute("""
                 INSERT OR REPLACE INTO database_metadata (key, value) 
@@ -180,6 +253,31 @@ class DatabaseManager:
             conn.commit()
             logger.info("Database schema initialized successfully")
     
+    def _ensure_scrape_success(self, cursor: sqlite3.Cursor, table: str, key: str):
+        """Add, backfill and maintain the scrape_success flag of a table
+        
+        Older tables lack the column, and the standalone scrapers insert rows
+        without it, so triggers derive it from official_name for every writer.
+        """
+        columns = {row[0] for row in cursor.execute("SELECT name FROM pragma_table_info(?)", (table,))}
+        if 'scrape_success' not in columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN scrape_success INTEGER DEFAULT 0")
+        
+        # Backfill rows written before the triggers existed (no-op once in sync)
+        success = _SCRAPE_SUCCESS_SQL.format(name='official_name')
+        cursor.execute(f"UPDATE {table} SET scrape_success = {success} WHERE scrape_success IS NOT {success}")
+        
+        new_success = _SCRAPE_SUCCESS_SQL.format(name='NEW.official_name')
+        for suffix, event in (('insert', 'INSERT'), ('update', 'UPDATE OF official_name')):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_success_{suffix}
+                AFTER {event} ON {table}
+                WHEN NEW.scrape_success IS NOT {new_success}
+                BEGIN
+                    UPDATE {table} SET scrape_success = {new_success} WHERE {key} = NEW.{key};
+                END
+            """)
+    
     def _create_indexes(self, cursor: sqlite3.Cursor):
         """Create optimized indexes for better query performance"""
         indexes = [
@@ -189,6 +287,11 @@ class DatabaseManager:
             "CREATE INDEX IF NOT EXISTS idx_sets_has_image ON lego_sets(has_image)",
             "CREATE INDEX IF NOT EXISTS idx_sets_released ON lego_sets(released)",
             
+            # Partial indexes matching the stats predicates
+            "CREATE INDEX IF NOT EXISTS idx_sets_found ON lego_sets(official_name) WHERE official_name NOT IN ('Not found', 'Error')",
+            "CREATE INDEX IF NOT EXISTS idx_sets_image_partial ON lego_sets(lego_code) WHERE has_image = 1",
+            "CREATE INDEX IF NOT EXISTS idx_sets_success ON lego_sets(scrape_success)",
+            
             # Minifig indexes
             "CREATE INDEX IF NOT EXISTS idx_minifig_code ON minifig(minifig_code)",
             "CREATE INDEX IF NOT EXISTS idx_minifig_has_image ON minifig(has_image)",
@@ -199,37 +302,145 @@ class DatabaseManager:
             "CREATE INDEX IF NOT EXISTS idx_relations_minifig ON set_minifig_relations(minifig_code)",
         ]
         
+        # Legacy lego_sets tables predate release_year
+        if cursor.execute(
+            "SELECT 1 FROM pragma_table_xinfo('lego_sets') WHERE name = 'release_year'"
+        ).fetchone():
+            indexes.append("CREATE INDEX IF NOT EXISTS idx_sets_theme_year ON lego_sets(theme, release_year)")
+        
         for index_sql in indexes:
             try:
                 cursor.execute(index_sql)
             except sqlite3.Error as e:
                 logger.warning(f"Could not create index: {e}")
     
+    def _table_columns(self, conn: sqlite3.Connection, table: str) -> Tuple[str, ...]:
+        """Writable columns of a table, in schema order (generated columns are hidden)"""
+        return tuple(
+            row[0] for row in conn.execute("SELECT name FROM pragma_table_info(?)", (table,))
+            if row[0] != 'created_at'
+        )
+    
+    def _upsert_sql(self, table: str, key: str, columns: Tuple[str, ...]) -> str:
+        """UPSERT statement for the columns a row supplies, built once per column tuple
+        
+        Every supplied column (derived and validated ones included) overwrites the
+        stored value, so a re-scrape that finds nothing clears stale data; columns
+        the caller did not supply are left untouched.
+        """
+        sql = self._upsert_statements.get((table, columns))
+        if sql is not None:
+            return sql
+        
+        updates = []
+        for col in columns:
+            if col == key:
+                continue
+            if col == 'scrape_attempts':
+                # The attempt counter is incremented from the existing row
+                updates.append(f"{col} = COALESCE({table}.{col}, 0) + 1")
+            else:
+                updates.append(f"{col} = excluded.{col}")
+        
+        sql = f"""
+            INSERT INTO {table} ({', '.join(columns)}) 
+            VALUES ({', '.join('?' for _ in columns)})
+            ON CONFLICT({key}) DO UPDATE SET {', '.join(updates)}
+        """
+        
+        # Hand back the updated counter from the same statement (SQLite 3.35+)
+        if 'scrape_attempts' in columns and sqlite3.sqlite_version_info >= (3, 35, 0):
+            sql += "RETURNING scrape_attempts"
+        self._upsert_statements[(table, columns)] = sql
+        return sql
+    
+    def _connect(self, layout: bool = False) -> sqlite3.Connection:
+        """Open a connection and apply the performance settings once
+        
+        ``layout`` also applies the file layout settings; only the writer opened by
+        _initialize_database needs them.
+        """
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=30.0,
+            check_same_thread=False
+        )
+        # Optimize SQLite settings
+        if layout:
+            # Only take effect on a new file before its first table, and before WAL
+            conn.execute("PRAGMA page_size = 8192")
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA mmap_size = 268435456")  # 256MB memory map for reads
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA cache_size = -64000")  # 64MB cache
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+    
     @contextmanager
     def _get_connection(self):
-        """Get database connection with proper configuration"""
-        conn = None
+        """Get the shared writer connection, holding the write lock while in use"""
+        with self._lock:
+            conn = self._writer
+            try:
+                if conn is None:
+                    conn = self._writer = self._connect()
+                
+                yield conn
+            except BaseException as e:
+                # The writer outlives this block: never leave a half-written
+                # transaction for the next caller's commit()
+                if conn:
+                    conn.rollback()
+                if isinstance(e, sqlite3.Error):
+                    raise DatabaseError(f"Database connection error: {str(e)}")
+                raise
+    
+    @contextmanager
+    def _get_reader(self):
+        """Get this thread's read-only connection; readers never wait for writers"""
+        conn = getattr(self._local, 'conn', None)
         try:
-            conn = sqlite3.connect(
-                str(self.db_path),
-                timeout=30.0,
-                check_same_thread=False
-            )
-            # Optimize SQLite settings
-            conn.execute("PRAGMA journal_mode = WAL")
-            conn.execute("PRAGMA synchronous = NORMAL")
-            conn.execute("PRAGMA cache_size = -64000")  # 64MB cache
-            conn.execute("PRAGMA temp_store = MEMORY")
-            conn.execute("PRAGMA foreign_keys = ON")
+            if conn is None:
+                conn = self._connect()
+                conn.execute("PRAGMA query_only = ON")
+                self._local.conn = conn
+                self._readers.append(conn)
             
             yield conn
         except sqlite3.Error as e:
-            if conn:
-                conn.rollback()
             raise DatabaseError(f"Database connection error: {str(e)}")
-        finally:
-            if conn:
+    
+    @contextmanager
+    def bulk_mode(self):
+        """Speed up a batch of writes by relaxing durability
+        
+        Commits inside the block skip fsync and never auto-checkpoint; the WAL
+        is checkpointed once on exit. A crash may lose the batch, which the
+        scraper can simply fetch again. The block holds the write lock, so
+        writes from other threads wait until it ends.
+        """
+        with self._get_connection() as conn:
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.execute("PRAGMA wal_autocheckpoint = 0")
+            try:
+                yield self
+            finally:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                conn.execute("PRAGMA wal_autocheckpoint = 1000")  # SQLite default
+                conn.execute("PRAGMA synchronous = NORMAL")
+    
+    def close(self):
+        """Close every connection opened by this manager (call at shutdown)"""
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            for conn in self._readers:
                 conn.close()
+            self._readers.clear()
+            self._local = threading.local()
     
     def backup_database(self, backup_name: str = None) -> str:
         """Create a backup of the database"""
@@ -239,17 +450,32 @@ class DatabaseManager:
         backup_path = self.backup_dir / backup_name
         
         try:
-            with self._lock:
-                shutil.copy2(self.db_path, backup_path)
+            # Fold the WAL into the main file, then take a consistent snapshot
+            # with the online backup API; it copies in steps and lets writers in
+            with self._get_connection() as conn:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            
+            with self._get_reader() as conn:
+                dest = sqlite3.connect(str(backup_path))
+                try:
+                    conn.backup(dest, pages=1024, sleep=0.005)
+                finally:
+                    dest.close()
             
             # Compress if backup is large
             backup_size = backup_path.stat().st_size
             if backup_size > 50 * 1024 * 1024:  # 50MB
-                import gzip
                 compressed_path = backup_path.with_suffix('.db.gz')
-                with open(backup_path, 'rb') as f_in:
-                    with gzip.open(compressed_path, 'wb') as f_out:
-                        shutil.copyfileobj(f_in, f_out)
+                compressor = shutil.which('pigz') or shutil.which('gzip')
+                if compressor:
+                    # Native (and with pigz, multi-threaded) compression
+                    with open(compressed_path, 'wb') as f_out:
+                        subprocess.run([compressor, '-1', '-c', str(backup_path)], stdout=f_out, check=True)
+                else:
+                    import gzip
+                    with open(backup_path, 'rb') as f_in:
+                        with gzip.open(compressed_path, 'wb', compresslevel=1) as f_out:
+                            shutil.copyfileobj(f_in, f_out)
                 backup_path.unlink()  # Remove uncompressed version
                 backup_path = compressed_path
             
@@ -259,18 +485,22 @@ class DatabaseManager:
         except Exception as e:
             raise DatabaseError(f"Backup failed: {str(e)}", operation="backup")
     
-    def validate_and_clean_data(self, data: Dict[str, Any], table: str) -> Dict[str, Any]:
-        """Validate and clean data before insertion"""
+    def validate_and_clean_data(self, data: Dict[str, Any], table: str,
+                                now_iso: Optional[str] = None) -> Dict[str, Any]:
+        """Validate and clean data before insertion
+        
+        Batch callers pass one ``now_iso`` timestamp for every row they write.
+        """
         cleaned_data = data.copy()
         
         if table == "lego_sets":
-            cleaned_data = self._validate_set_data(cleaned_data)
+            cleaned_data = self._validate_set_data(cleaned_data, now_iso)
         elif table == "minifig":
-            cleaned_data = self._validate_minifig_data(cleaned_data)
+            cleaned_data = self._validate_minifig_data(cleaned_data, now_iso)
         
         return cleaned_data
     
-    def _validate_set_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _validate_set_data(self, data: Dict[str, Any], now_iso: Optional[str] = None) -> Dict[str, Any]:
         """Validate and enhance LEGO set data"""
         # Extract numeric values
         data['pieces_numeric'] = self._extract_numeric(data.get('number_of_pieces'))
@@ -282,8 +512,9 @@ class DatabaseManager:
         data['release_year'] = self._extract_year(data.get('released'))
         
         # Set metadata
-        data['updated_at'] = datetime.now(timezone.utc).isoformat()
-        data['last_scraped'] = datetime.now(timezone.utc).isoformat()
+        now_iso = now_iso or datetime.now(timezone.utc).isoformat()
+        data['updated_at'] = now_iso
+        data['last_scraped'] = now_iso
         
         # Calculate data completeness score
         data['data_completeness_score'] = self._calculate_completeness_score(data, 'set')
@@ -293,15 +524,70 @@ class DatabaseManager:
         
         return data
     
-    def _validate_minifig_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _validate_set_data_batch(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Validate and enhance many LEGO sets at once, column by column
+        
+        Same result as _validate_set_data per row, but the regex extraction
+        and completeness scoring run as pandas string/column operations.
+        """
+        import pandas as pd  # imported lazily: only batch validation needs it
+        
+        df = pd.DataFrame(rows).reindex(columns=list(dict.fromkeys(
+            [col for row in rows for col in row] + list(_SET_SOURCE_FIELDS)
+        )))
+        
+        def extract(field: str, pattern: str, cast: str, clean: re.Pattern = None) -> List[Any]:
+            values = df[field].astype(object)
+            usable = values.notna() & values.astype(bool) & ~values.isin(_MISSING_VALUES)
+            text = values[usable].astype(str)
+            if clean is not None:
+                text = text.str.replace(clean, '', regex=True)
+            found = text.str.extract(pattern, expand=False).dropna()
+            result = [None] * len(df)
+            for i, value in zip(found.index, found.astype(cast).tolist()):
+                result[i] = value
+            return result
+        
+        price_pattern = f"({_PRICE_NUM_RE.pattern})"
+        extracted = {
+            'pieces_numeric': extract('number_of_pieces', f"({_NUM_RE.pattern})", 'int64'),
+            'minifigs_numeric': extract('number_of_minifigs', f"({_NUM_RE.pattern})", 'int64'),
+            'price_eur_numeric': extract('retail_price_eur', price_pattern, 'float64', _PRICE_CLEAN_RE),
+            'price_gbp_numeric': extract('retail_price_gbp', price_pattern, 'float64', _PRICE_CLEAN_RE),
+            'value_new_numeric': extract('value_new_sealed', price_pattern, 'float64', _PRICE_CLEAN_RE),
+            'value_used_numeric': extract('value_used', price_pattern, 'float64', _PRICE_CLEAN_RE),
+            'release_year': extract('released', f"({_YEAR_RE.pattern})", 'int64'),
+        }
+        
+        # Completeness as a boolean mask sum over the scored fields
+        scored = df[list(_SET_SCORE_FIELDS)].astype(object)
+        filled = scored.notna() & scored.astype(bool) & ~scored.isin(_MISSING_VALUES)
+        scores = (filled.sum(axis=1) / len(_SET_SCORE_FIELDS)).tolist()
+        
+        now_iso = datetime.now(timezone.utc).isoformat()  # one timestamp for the whole batch
+        validated_rows = []
+        for i, row in enumerate(rows):
+            data = row.copy()
+            for field, values in extracted.items():
+                data[field] = values[i]
+            data['updated_at'] = now_iso
+            data['last_scraped'] = now_iso
+            data['data_completeness_score'] = scores[i]
+            data['validation_status'] = 'validated' if scores[i] > 0.7 else 'incomplete'
+            validated_rows.append(data)
+        
+        return validated_rows
+    
+    def _validate_minifig_data(self, data: Dict[str, Any], now_iso: Optional[str] = None) -> Dict[str, Any]:
         """Validate and enhance minifig data"""
         # Extract numeric values
         data['year_numeric'] = self._extract_numeric(data.get('year'))
         data['price_gbp_numeric'] = self._extract_price(data.get('retail_price_gbp'))
         
         # Set metadata
-        data['updated_at'] = datetime.now(timezone.utc).isoformat()
-        data['last_scraped'] = datetime.now(timezone.utc).isoformat()
+        now_iso = now_iso or datetime.now(timezone.utc).isoformat()
+        data['updated_at'] = now_iso
+        data['last_scraped'] = now_iso
         
         # Calculate data completeness score
         data['data_completeness_score'] = self._calculate_completeness_score(data, 'minifig')
@@ -313,89 +599,68 @@ class DatabaseManager:
     
     def _extract_numeric(self, value: Any) -> Optional[int]:
         """Extract numeric value from string"""
-        if not value or value in ['Not found', 'Error', '']:
+        if not value or value in _MISSING_VALUES:
             return None
         
         # Extract first number found
-        numbers = re.findall(r'\d+', str(value))
-        return int(numbers[0]) if numbers else None
+        match = _NUM_RE.search(str(value))
+        return int(match.group()) if match else None
     
     def _extract_price(self, value: Any) -> Optional[float]:
         """Extract price value from string"""
-        if not value or value in ['Not found', 'Error', '']:
+        if not value or value in _MISSING_VALUES:
             return None
         
         # Remove currency symbols and extract decimal number
-        price_str = re.sub(r'[£€$,\s]', '', str(value))
-        numbers = re.findall(r'\d+\.?\d*', price_str)
-        return float(numbers[0]) if numbers else None
+        price_str = _PRICE_CLEAN_RE.sub('', str(value))
+        match = _PRICE_NUM_RE.search(price_str)
+        return float(match.group()) if match else None
     
     def _extract_year(self, value: Any) -> Optional[int]:
         """Extract year from date string"""
-        if not value or value in ['Not found', 'Error', '']:
+        if not value or value in _MISSING_VALUES:
             return None
         
         # Look for 4-digit year
-        years = re.findall(r'\b(19|20)\d{2}\b', str(value))
-        return int(years[0]) if years else None
+        match = _YEAR_RE.search(str(value))
+        return int(match.group()) if match else None
     
     def _calculate_completeness_score(self, data: Dict[str, Any], data_type: str) -> float:
         """Calculate data completeness score (0.0 to 1.0)"""
-        if data_type == 'set':
-            fields = [
-                'official_name', 'number_of_pieces', 'released', 'theme',
-                'retail_price_eur', 'retail_price_gbp', 'image_path'
-            ]
-        else:  # minifig
-            fields = [
-                'official_name', 'year', 'theme', 'retail_price_gbp', 'image_path'
-            ]
-        
-        completed_fields = 0
-        for field in fields:
-            value = data.get(field)
-            if value and value not in ['Not found', 'Error', '', None]:
-                completed_fields += 1
+        fields = _SET_SCORE_FIELDS if data_type == 'set' else _MINIFIG_SCORE_FIELDS
         
+        completed_fields = sum(1 for value in map(data.get, fields) if value and value not in _MISSING_VALUES)
         return completed_fields / len(fields)
     
+    def _upsert_params(self, validated_data: Dict[str, Any],
+                       table_columns: Tuple[str, ...]) -> Tuple[Tuple[str, ...], List[Any]]:
+        """The table columns a validated row supplies (schema order) and their values"""
+        # Set success flag
+        validated_data['scrape_success'] = 0 if validated_data.get('official_name') in _FAILED_NAMES else 1
+        validated_data['scrape_attempts'] = 1  # first attempt; existing rows are incremented in SQL
+        # Legacy tables keep has_image as a plain column (pragma_table_info hides the
+        # generated one): fill it with the same rule as the generated column
+        if 'has_image' in table_columns and 'image_path' in validated_data:
+            validated_data['has_image'] = int(validated_data.get('image_path') not in _MISSING_VALUES)
+        
+        columns = tuple(col for col in table_columns if col in validated_data)
+        return columns, [validated_data[col] for col in columns]
+    
     def insert_or_update_set(self, set_data: Dict[str, Any]) -> bool:
         """Insert or update a LEGO set with validation"""
         try:
-            validated_data = self.validate_and_clean_data(set_data, 'lego_sets')
+            lego_code = set_data['lego_code']
+            columns, params = self._upsert_params(self.validate_and_clean_data(set_data, 'lego_sets'),
+                                                  self._set_columns)
             
             with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Check if record exists
-                cursor.execute("SELECT scrape_attempts FROM lego_sets WHERE lego_code = ?", 
-                             (validated_data['lego_code'],))
-                existing = cursor.fetchone()
-                
-                if existing:
-                    validated_data['scrape_attempts'] = existing[0] + 1
-                else:
-                    validated_data['scrape_attempts'] = 1
-                
-                # Set success flag
-                validated_data['scrape_success'] = 1 if validated_data.get('official_name') not in ['Not found', 'Error'] else 0
-                
-                # Prepare SQL for upsert
-                columns = list(validated_data.keys())
-                placeholders = ', '.join(['?' for _ in columns])
-                conflict_updates = ', '.join([f"{col} = excluded.{col}" for col in columns if col != 'lego_code'])
-                
-                sql = f"""
-                    INSERT INTO lego_sets ({', '.join(columns)}) 
-                    VALUES ({placeholders})
-                    ON CONFLICT(lego_code) DO UPDATE SET {conflict_updates}
-                """
-                
-                cursor.execute(sql, list(validated_data.values()))
+                cursor = conn.execute(self._upsert_sql('lego_sets', 'lego_code', columns), params)
+                attempts = cursor.fetchone()  # RETURNING row, if supported
                 conn.commit()
-                
-                logger.debug(f"Set {validated_data['lego_code']} saved successfully")
-                return True
+            
+            logger.debug(f"Set {lego_code} saved successfully"
+                         + (f" (attempt {attempts[0]})" if attempts else ""))
+            return True
                 
         except Exception as e:
             logger.error(f"Failed to insert/update set {set_data.get('lego_code', 'unknown')}: {e}")
@@ -404,93 +669,100 @@ class DatabaseManager:
     def insert_or_update_minifig(self, minifig_data: Dict[str, Any]) -> bool:
         """Insert or update a minifig with validation"""
         try:
-            validated_data = self.validate_and_clean_data(minifig_data, 'minifig')
+            minifig_code = minifig_data['minifig_code']
+            columns, params = self._upsert_params(self.validate_and_clean_data(minifig_data, 'minifig'),
+                                                  self._minifig_columns)
             
             with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Check if record exists
-                cursor.execute("SELECT scrape_attempts FROM minifig WHERE minifig_code = ?", 
-                             (validated_data['minifig_code'],))
-                existing = cursor.fetchone()
-                
-                if existing:
-                    validated_data['scrape_attempts'] = existing[0] + 1
-                else:
-                    validated_data['scrape_attempts'] = 1
-                
-                # Set success flag
-                validated_data['scrape_success'] = 1 if validated_data.get('official_name') not in ['Not found', 'Error'] else 0
-                
-                # Prepare SQL for upsert
-                columns = list(validated_data.keys())
-                placeholders = ', '.join(['?' for _ in columns])
-                conflict_updates = ', '.join([f"{col} = excluded.{col}" for col in columns if col != 'minifig_code'])
-                
-                sql = f"""
-                    INSERT INTO minifig ({', '.join(columns)}) 
-                    VALUES ({placeholders})
-                    ON CONFLICT(minifig_code) DO UPDATE SET {conflict_updates}
-                """
-                
-                cursor.execute(sql, list(validated_data.values()))
+                cursor = conn.execute(self._upsert_sql('minifig', 'minifig_code', columns), params)
+                attempts = cursor.fetchone()  # RETURNING row, if supported
                 conn.commit()
-                
-                logger.debug(f"Minifig {validated_data['minifig_code']} saved successfully")
-                return True
+            
+            logger.debug(f"Minifig {minifig_code} saved successfully"
+                         + (f" (attempt {attempts[0]})" if attempts else ""))
+            return True
                 
         except Exception as e:
             logger.error(f"Failed to insert/update minifig {minifig_data.get('minifig_code', 'unknown')}: {e}")
             raise DatabaseError(f"Minifig insertion failed: {str(e)}", operation="insert_minifig")
     
+    def insert_or_update_sets_bulk(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert or update many LEGO sets in a single transaction"""
+        return self._bulk_upsert(rows, 'lego_sets', 'lego_code', self._set_columns)
+    
+    def insert_or_update_minifigs_bulk(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert or update many minifigs in a single transaction"""
+        return self._bulk_upsert(rows, 'minifig', 'minifig_code', self._minifig_columns)
+    
+    def _bulk_upsert(self, rows: List[Dict[str, Any]], table: str, key: str,
+                     table_columns: Tuple[str, ...]) -> int:
+        """Validate rows and write them with one executemany and one commit"""
+        if not rows:
+            return 0
+        
+        try:
+            if table == 'lego_sets':
+                validated_rows = self._validate_set_data_batch(rows)
+            else:
+                now_iso = datetime.now(timezone.utc).isoformat()
+                validated_rows = [self.validate_and_clean_data(row, table, now_iso) for row in rows]
+            prepared = [self._upsert_params(data, table_columns) for data in validated_rows]
+            
+            with self._get_connection() as conn:
+                # One executemany per run of rows supplying the same columns (usually
+                # the whole batch), keeping the rows in order
+                for columns, group in groupby(prepared, key=itemgetter(0)):
+                    conn.executemany(self._upsert_sql(table, key, columns), [params for _, params in group])
+                conn.commit()
+            
+            logger.debug(f"Saved {len(prepared)} rows to {table} in one transaction")
+            return len(prepared)
+            
+        except Exception as e:
+            logger.error(f"Bulk insert/update into {table} failed: {e}")
+            raise DatabaseError(f"Bulk insertion failed: {str(e)}", operation="bulk_insert", table=table)
+    
     def get_comprehensive_stats(self) -> DatabaseStats:
         """Get comprehensive database statistics"""
         try:
-            with self._get_connection() as conn:
+            with self._get_reader() as conn:
                 stats = DatabaseStats()
                 
-                # Sets statistics
-                set_stats = pd.read_sql_query("""
+                # Sets and minifig aggregates in one round trip (sets row first)
+                cursor = conn.execute("""
                     SELECT 
-                        COUNT(*) as total,
-                        SUM(CASE WHEN official_name IS NOT NULL AND official_name NOT IN ('Not found', 'Error') THEN 1 ELSE 0 END) as found,
-                        SUM(CASE WHEN has_image = 1 THEN 1 ELSE 0 END) as with_images,
-                        COUNT(DISTINCT theme) as unique_themes,
-                        'Unknown' as last_updated
+                        COUNT(*),
+                        SUM(scrape_success),
+                        SUM(has_image = 1),
+                        COUNT(DISTINCT theme)
                     FROM lego_sets
-                """, conn).iloc[0]
-                
-                stats.total_sets = set_stats['total']
-                stats.found_sets = set_stats['found']
-                stats.sets_with_images = set_stats['with_images']
-                stats.unique_themes = set_stats['unique_themes']
-                
-                # Minifig statistics
-                minifig_stats = pd.read_sql_query("""
+                    UNION ALL
                     SELECT 
-                        COUNT(*) as total,
-                        SUM(CASE WHEN official_name IS NOT NULL AND official_name NOT IN ('Not found', 'Error') THEN 1 ELSE 0 END) as found,
-                        SUM(CASE WHEN has_image = 1 THEN 1 ELSE 0 END) as with_images,
-                        COUNT(DISTINCT year) as unique_years,
-                        'Unknown' as last_updated
+                        COUNT(*),
+                        SUM(scrape_success),
+                        SUM(has_image = 1),
+                        COUNT(DISTINCT year)
                     FROM minifig
-                """, conn).iloc[0]
+                """)
+                set_row, minifig_row = cursor.fetchall()
+                
+                total, found, with_images, unique_themes = set_row
+                stats.total_sets = total
+                stats.found_sets = found or 0
+                stats.sets_with_images = with_images or 0
+                stats.unique_themes = unique_themes
                 
-                stats.total_minifigs = minifig_stats['total']
-                stats.found_minifigs = minifig_stats['found']
-                stats.minifigs_with_images = minifig_stats['with_images']
-                stats.unique_years = minifig_stats['unique_years']
+                total, found, with_images, unique_years = minifig_row
+                stats.total_minifigs = total
+                stats.found_minifigs = found or 0
+                stats.minifigs_with_images = with_images or 0
+                stats.unique_years = unique_years
                 
                 # Database size
                 stats.database_size_mb = self.db_path.stat().st_size / (1024 * 1024)
                 
-                # Last updated
-                last_updated = max(
-                    set_stats.get('last_updated', ''),
-                    minifig_stats.get('last_updated', '')
-                )
-                if last_updated:
-                    stats.last_updated = last_updated
+                # Last updated is not tracked per row yet
+                stats.last_updated = 'Unknown'
                 
                 return stats
                 
@@ -498,67 +770,137 @@ class DatabaseManager:
             logger.error(f"Failed to get database stats: {e}")
             return DatabaseStats()
     
-    def optimize_database(self):
-        """Optimize database performance"""
+    def optimize_database(self, full_vacuum: bool = False):
+        """Optimize database performance (refresh planner stats, reclaim free pages)"""
         try:
+            logger.info("Starting database optimization...")
+            self.analyze()
+            self.compact(full=full_vacuum)
+            
             with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                logger.info("Starting database optimization...")
-                
-                # Analyze tables for query optimization
-                cursor.execute("ANALYZE")
-                
-                # Vacuum to reclaim space
-                cursor.execute("VACUUM")
-                
                 # Update metadata
-                cursor.execute("""
+                conn.execute("""
                     INSERT OR REPLACE INTO database_metadata (key, value) 
                     VALUES ('last_optimization', ?)
                 """, (datetime.now(timezone.utc).isoformat(),))
-                
                 conn.commit()
-                logger.info("Database optimization completed")
+            
+            logger.info("Database optimization completed")
                 
         except Exception as e:
             logger.error(f"Database optimization failed: {e}")
             raise DatabaseError(f"Optimization failed: {str(e)}", operation="optimize")
     
-    def export_to_formats(self, output_dir: str = "exports"):
-        """Export database to multiple formats"""
+    def analyze(self):
+        """Refresh query planner statistics for tables whose stats are stale"""
+        with self._get_connection() as conn:
+            conn.execute("PRAGMA optimize")
+    
+    def compact(self, full: bool = False):
+        """Reclaim free pages
+        
+        Uses incremental auto-vacuum when the database supports it. A full VACUUM
+        rewrites the whole file under an exclusive lock, so it only runs on request.
+        """
+        with self._get_connection() as conn:
+            if full:
+                conn.execute("VACUUM")
+                return
+            
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:  # INCREMENTAL
+                # executescript steps the pragma to completion (execute frees one page)
+                conn.executescript("PRAGMA incremental_vacuum;")
+            else:
+                logger.info("Incremental vacuum not enabled; use compact(full=True) to reclaim space")
+    
+    def export_to_formats(self, formats: Iterable[str] = ('csv',), output_dir: str = "exports",
+                          chunksize: int = 10_000):
+        """Export database to the requested formats ('csv', 'json', 'xlsx')"""
+        formats = set(formats)
+        unknown = formats - _EXPORT_FORMATS
+        if unknown:
+            raise DatabaseError(f"Unsupported export formats: {', '.join(sorted(unknown))}", operation="export")
+        
         output_path = Path(output_dir)
         output_path.mkdir(exist_ok=True)
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
+        # Export with Excel if requested and available (write-only workbooks stream rows to disk)
+        workbook = None
+        if 'xlsx' in formats:
+            try:
+                from openpyxl import Workbook
+                workbook = Workbook(write_only=True)
+            except ImportError:
+                logger.warning("Excel export requires openpyxl package")
+        
         try:
-            with self._get_connection() as conn:
-                # Export sets
-                sets_df = pd.read_sql_query("SELECT * FROM lego_sets", conn)
-                sets_df.to_csv(output_path / f"lego_sets_{timestamp}.csv", index=False)
-                sets_df.to_json(output_path / f"lego_sets_{timestamp}.json", orient='records', indent=2)
-                
-                # Export minifigs
-                minifigs_df = pd.read_sql_query("SELECT * FROM minifig", conn)
-                minifigs_df.to_csv(output_path / f"minifigs_{timestamp}.csv", index=False)
-                minifigs_df.to_json(output_path / f"minifigs_{timestamp}.json", orient='records', indent=2)
-                
-                # Export with Excel if available
-                try:
-                    with pd.ExcelWriter(output_path / f"lego_database_{timestamp}.xlsx") as writer:
-                        sets_df.to_excel(writer, sheet_name='LEGO Sets', index=False)
-                        minifigs_df.to_excel(writer, sheet_name='Minifigures', index=False)
-                except ImportError:
-                    logger.warning("Excel export requires openpyxl package")
-                
-                logger.info(f"Database exported to {output_path}")
+            with self._get_reader() as conn:
+                for table, name, sheet_name in (('lego_sets', 'lego_sets', 'LEGO Sets'),
+                                                ('minifig', 'minifigs', 'Minifigures')):
+                    self._export_table(
+                        conn, table,
+                        output_path / f"{name}_{timestamp}.csv" if 'csv' in formats else None,
+                        output_path / f"{name}_{timestamp}.json" if 'json' in formats else None,
+                        workbook.create_sheet(sheet_name) if workbook is not None else None,
+                        chunksize
+                    )
+                
+                if workbook is not None:
+                    workbook.save(output_path / f"lego_database_{timestamp}.xlsx")
+                
+                logger.info(f"Database exported to {output_path} ({', '.join(sorted(formats))})")
                 
         except Exception as e:
             logger.error(f"Export failed: {e}")
             raise DatabaseError(f"Export failed: {str(e)}", operation="export")
-
-
+    
+    def _export_table(self, conn: sqlite3.Connection, table: str, csv_path: Optional[Path],
+                      json_path: Optional[Path], sheet: Any, chunksize: int):
+        """Stream one table from the cursor to the requested outputs, one chunk at a time"""
+        cursor = conn.execute(f"SELECT * FROM {table}")
+        columns = [col[0] for col in cursor.description]
+        
+        with ExitStack() as stack:
+            csv_writer = None
+            if csv_path is not None:
+                csv_file = stack.enter_context(open(csv_path, 'w', encoding='utf-8', newline=''))
+                csv_writer = csv.writer(csv_file)
+                csv_writer.writerow(columns)
+            
+            json_file = None
+            if json_path is not None:
+                json_file = stack.enter_context(open(json_path, 'wb'))
+                json_file.write(b'[\n')
+            
+            if sheet is not None:
+                sheet.append(columns)
+            
+            first = True
+            while True:
+                rows = cursor.fetchmany(chunksize)
+                if not rows:
+                    break
+                
+                if csv_writer is not None:
+                    csv_writer.writerows(rows)
+                
+                if json_file is not None:
+                    # Records of this chunk without the enclosing brackets
+                    records = dump_json([dict(zip(columns, row)) for row in rows])[1:-1].strip(b'\n')
+                    json_file.write(records if first else b',\n' + records)
+                
+                if sheet is not None:
+                    for row in rows:
+                        sheet.append(row)
+                
+                first = False
+            
+            if json_file is not None:
+                json_file.write(b'\n]')
+    
+    
 # Global database manager instance
 _db_manager = None
 
@@ -567,4 +909,5 @@ def get_database_manager(db_path: str = "lego_database/LegoDatabase.db") -> Data
     global _db_manager
     if _db_manager is None:
         _db_manager = DatabaseManager(db_path)
+        atexit.register(_db_manager.close)
     return _db_manager
@@ -4,8 +4,14 @@ Creates a comprehensive database with set images and key information
 """
 
 import os
+import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
 from typing import List, Dict, Optional
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -19,6 +25,111 @@ import pandas as pd
 import sqlite3
 from PIL import Image
 
+# Valid LEGO set codes: letters, digits, dashes and underscores only
+_CODE_RE = re.compile(r'[A-Za-z0-9_-]+')
+
+# Lista principale di codici (senza punti), usata quando non ne vengono passati altri
+_DEFAULT_LEGO_CODES = (
+    "3920","9469","9470","9471","9472","9473","9474","9476",
+    "10237","10316","10333", "30210","30211","30212","30213",
+    "30215","30216","40630","40631","40632","40693","40751",
+    "50011","71171","71218","71219","71220","79000","79001",
+    "79002","79003","79004","79005","79006","79007","79008",
+    "79010","79011","79012","79013","79014","79015","79016",
+    "79017","79018","5000202","850674","850680","850514",
+    "850515","850516","10367"
+)
+
+# Image downloads run in the background while the browser moves on
+_IMAGE_DOWNLOAD_WORKERS = 4
+
+# Set detail fields and the table cell each one is read from
+_DETAIL_XPATHS = {
+    'number_of_pieces': "//td[contains(text(), 'Pieces')]/following-sibling::td[1]",
+    'number_of_minifigs': "//td[contains(text(), 'Minifigs')]/following-sibling::td[1]",
+    'released': "//td[contains(text(), 'Released')]/following-sibling::td[1]",
+    'retired': "//td[contains(text(), 'Retired')]/following-sibling::td[1]",
+    'retail_price_eur': "//td[contains(text(), 'RRP EUR')]/following-sibling::td[1]",
+    'retail_price_gbp': "//td[contains(text(), 'RRP GBP')]/following-sibling::td[1]",
+    'value_new_sealed': "//td[contains(text(), 'New Sealed')]/following-sibling::td[1]",
+    'value_used': "//td[contains(text(), 'Used')]/following-sibling::td[1]"
+}
+
+# Prima cerca immagini grandi
+_IMAGE_XPATHS = (
+    "//img[contains(@src, '/resources/images/sets/') and not(contains(@src, 'thumb')) and not(contains(@src, 'thumbnail'))]",
+    "//img[contains(@src, '.jpg') and string-length(@src) > 30 and string-length(@src) < 200]",
+    "//img[contains(@src, '/sets/') and contains(@src, '.jpg')]",
+    "//img[@src and (contains(@src, 'lego-') or contains(@src, 'set-')) and not(contains(@src, 'thumb'))]",
+)
+# Se non trova nulla, cerca thumbnail
+_THUMBNAIL_XPATHS = (
+    "//img[contains(@src, 'thumbnail') or contains(@src, 'thumb')][@src]",
+    "//img[contains(@src, '.jpg') and contains(@src, 'http')][@src]",
+)
+_ALL_IMAGE_XPATHS = _IMAGE_XPATHS + _THUMBNAIL_XPATHS
+
+# More specific theme selectors - avoid navigation elements
+_THEME_XPATHS = (
+    # Try to find theme in the breadcrumb or set details area
+    "//*[@id='ContentPlaceHolder1_SetDetails']//*[contains(text(), 'Theme')]/following-sibling::*[1]",
+    # Look for theme in the set information panel
+    "//*[@id='ContentPlaceHolder1_PanelSetFacts']//*[contains(text(), 'Theme')]/following-sibling::*[1]",
+    # Look for breadcrumb theme links
+    "//div[contains(@class, 'breadcrumb')]//a[position()=2]",
+    # Try to find theme in specific data areas only
+    "//*[@class='set-info' or @class='set-details']//*[contains(text(), 'Theme')]/following-sibling::*[1]",
+)
+_NAV_TERMS = ('browse', 'deals', 'analysis', 'collection', 'sign', 'region', 'menu')
+
+# Text of the first node matched by each XPath, or null when there is no
+# match or the node is not rendered (the is_displayed() check)
+_VISIBLE_TEXTS_JS = """
+return arguments[0].map(function (xpath) {
+    try {
+        var node = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        return node && node.getClientRects().length ? node.innerText.trim() : null;
+    } catch (e) {
+        return null;
+    }
+});
+"""
+
+# Resources the scraper never needs the browser to fetch: image URLs are read
+# from the DOM and downloaded separately. CSS stays, is_displayed() relies on it
+_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg",
+    "*.woff", "*.woff2", "*.ttf",
+    "*googletagmanager*", "*google-analytics*", "*doubleclick*",
+]
+
+# Quick exclude common non-set images
+_EXCLUDED_IMAGE_TERMS = ('logo', 'icon', 'button', 'arrow', 'star', 'flag')
+
+# Evaluates the XPath selectors in priority order inside the browser and
+# returns [selector index, src] for the first valid image URL (or null):
+# HTTP/HTTPS, 20-300 characters, an image extension and no excluded term
+_FIRST_VALID_IMAGE_JS = """
+var xpaths = arguments[0], exclude = arguments[1];
+for (var i = 0; i < xpaths.length; i++) {
+    var found;
+    try {
+        found = document.evaluate(xpaths[i], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    } catch (e) {
+        continue;
+    }
+    for (var k = 0; k < Math.min(found.snapshotLength, 3); k++) {
+        var src = found.snapshotItem(k).src || '', lower = src.toLowerCase();
+        if (src.length >= 20 && src.length <= 300 && /^https?:\\/\\//.test(src) &&
+                /\\.(jpe?g|png)/.test(lower) &&
+                !exclude.some(function (term) { return lower.indexOf(term) >= 0; })) {
+            return [i, src];
+        }
+    }
+}
+return null;
+"""
+
 
 class LegoImageDatabase:
     """Enhanced LEGO scraper that also downloads set images"""
@@ -28,6 +139,15 @@ class LegoImageDatabase:
         self.images_dir = os.path.join("lego_database", "images")  # <-- usa solo questa cartella
         self.database_dir = "lego_database"
         self._setup_directories()
+        # One keep-alive session for every image: TCP/TLS handshakes are reused
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        adapter = HTTPAdapter(
+            pool_maxsize=_IMAGE_DOWNLOAD_WORKERS,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
     def _setup_directories(self):
         """Create necessary directories"""
@@ -46,10 +166,7 @@ class LegoImageDatabase:
             if os.path.exists(filepath):
                 return filepath
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(image_url, headers=headers, timeout=10)
+            response = self.session.get(image_url, timeout=10)
             response.raise_for_status()
             
             with open(filepath, 'wb') as f:
@@ -73,6 +190,13 @@ class LegoImageDatabase:
             print(f"    ❌ Failed to download image: {str(e)}")
             return None
 
+
+@lru_cache(maxsize=None)
+def _chromedriver_path() -> str:
+    """Resolve the ChromeDriver binary once per process (disk scan, maybe a download)"""
+    return ChromeDriverManager().install()
+
+
 class BaseLegoScraper:
     """Base scraper class for LEGO sets with essential functionality"""
     
@@ -88,9 +212,16 @@ class BaseLegoScraper:
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--disable-gpu')
         options.add_argument('--window-size=1920,1080')
+        # Return from driver.get() at DOMContentLoaded: the scraper only reads the DOM
+        options.page_load_strategy = 'eager'
         
-        service = Service(ChromeDriverManager().install())
+        service = Service(self.config.CHROMEDRIVER_PATH or _chromedriver_path())
         self.driver = webdriver.Chrome(service=service, options=options)
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URLS})
+        except Exception:
+            pass  # CDP non disponibile: carica la pagina completa
         return self.driver
     
     def wait_and_find_element(self, by, value, timeout=5):
@@ -133,18 +264,7 @@ class BaseLegoScraper:
                 pass
             
             # Extract other details using basic selectors
-            selectors = {
-                'number_of_pieces': "//td[contains(text(), 'Pieces')]/following-sibling::td[1]",
-                'number_of_minifigs': "//td[contains(text(), 'Minifigs')]/following-sibling::td[1]",
-                'released': "//td[contains(text(), 'Released')]/following-sibling::td[1]",
-                'retired': "//td[contains(text(), 'Retired')]/following-sibling::td[1]",
-                'retail_price_eur': "//td[contains(text(), 'RRP EUR')]/following-sibling::td[1]",
-                'retail_price_gbp': "//td[contains(text(), 'RRP GBP')]/following-sibling::td[1]",
-                'value_new_sealed': "//td[contains(text(), 'New Sealed')]/following-sibling::td[1]",
-                'value_used': "//td[contains(text(), 'Used')]/following-sibling::td[1]"
-            }
-            
-            for field, xpath in selectors.items():
+            for field, xpath in _DETAIL_XPATHS.items():
                 try:
                     element = self.driver.find_element(By.XPATH, xpath)
                     setattr(default_details, field, element.text.strip())
@@ -168,18 +288,33 @@ class EnhancedLegoScraper(BaseLegoScraper):
     def __init__(self, config: Config):
         super().__init__(config)
         self.image_db = LegoImageDatabase(config)
+        self._image_pool = None
     
     def __enter__(self):
         """Context manager entry"""
         self.setup_driver()
+        self._image_pool = ThreadPoolExecutor(
+            max_workers=_IMAGE_DOWNLOAD_WORKERS, thread_name_prefix="set-images"
+        )
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit"""
         if self.driver:
             self.driver.quit()
+        if self._image_pool:
+            self._image_pool.shutdown(wait=True)
+            self._image_pool = None
         return False
     
+    @staticmethod
+    def resolve_image_paths(rows: List[Dict]) -> List[Dict]:
+        """Replace pending background downloads with their final image path"""
+        for row in rows:
+            if isinstance(row.get('image_path'), Future):
+                row['image_path'] = row['image_path'].result() or 'Not found'
+        return rows
+    
     def extract_enhanced_set_data(self, lego_code: str) -> Dict:
         """Extract comprehensive data including image"""
         
@@ -211,10 +346,16 @@ class EnhancedLegoScraper(BaseLegoScraper):
                 image_url = self._extract_image_url()
                 if image_url:
                     data['image_url'] = image_url
-                    # Download image
-                    image_path = self.image_db.download_set_image(lego_code, image_url)
-                    if image_path:
-                        data['image_path'] = image_path
+                    # Download image (in background when used as a context manager;
+                    # call resolve_image_paths() on the results afterwards)
+                    if self._image_pool:
+                        data['image_path'] = self._image_pool.submit(
+                            self.image_db.download_set_image, lego_code, image_url
+                        )
+                    else:
+                        image_path = self.image_db.download_set_image(lego_code, image_url)
+                        if image_path:
+                            data['image_path'] = image_path
                 
                 # Extract theme information
                 theme_info = self._extract_theme_info()
@@ -228,107 +369,48 @@ class EnhancedLegoScraper(BaseLegoScraper):
     
     def _extract_image_url(self) -> Optional[str]:
         """Extract high-quality image URL from BrickEconomy, fallback to thumbnail"""
-        time.sleep(0.1)
-        # Prima cerca immagini grandi
-        image_selectors = [
-            "//img[contains(@src, '/resources/images/sets/') and not(contains(@src, 'thumb')) and not(contains(@src, 'thumbnail'))]",
-            "//img[contains(@src, '.jpg') and string-length(@src) > 30 and string-length(@src) < 200]",
-            "//img[contains(@src, '/sets/') and contains(@src, '.jpg')]",
-            "//img[@src and (contains(@src, 'lego-') or contains(@src, 'set-')) and not(contains(@src, 'thumb'))]",
-        ]
-        # Se non trova nulla, cerca thumbnail
-        fallback_selectors = [
-            "//img[contains(@src, 'thumbnail') or contains(@src, 'thumb')][@src]",
-            "//img[contains(@src, '.jpg') and contains(@src, 'http')][@src]",
-        ]
-        # Prova prima con immagini grandi
-        for i, selector in enumerate(image_selectors, 1):
-            try:
-                elements = self.driver.find_elements(By.XPATH, selector)
-                for element in elements[:3]:
-                    src = element.get_attribute('src')
-                    if src and self._is_valid_thumbnail_url(src):
-                        print(f"      🖼️ High-quality image found (selector {i}): {src[:60]}...")
-                        return src
-            except:
-                continue
-        # Fallback ai thumbnail
-        for i, selector in enumerate(fallback_selectors, 1):
-            try:
-                elements = self.driver.find_elements(By.XPATH, selector)
-                for element in elements[:3]:
-                    src = element.get_attribute('src')
-                    if src and self._is_valid_thumbnail_url(src):
-                        print(f"      🖼️ Thumbnail found (selector {i}): {src[:60]}...")
-                        return src
-            except:
-                continue
+        # Attendi che ci sia almeno un'immagine nel DOM invece di una pausa fissa
+        self.wait_and_find_element(By.TAG_NAME, "img", timeout=2)
+        try:
+            found = self.driver.execute_script(
+                _FIRST_VALID_IMAGE_JS, _ALL_IMAGE_XPATHS, _EXCLUDED_IMAGE_TERMS
+            )
+        except Exception:
+            found = None
+        # Prima le immagini grandi, poi il fallback ai thumbnail
+        if found:
+            i, src = found
+            if i < len(_IMAGE_XPATHS):
+                print(f"      🖼️ High-quality image found (selector {i + 1}): {src[:60]}...")
+            else:
+                print(f"      🖼️ Thumbnail found (selector {i + 1 - len(_IMAGE_XPATHS)}): {src[:60]}...")
+            return src
         print(f"      ❌ No valid image found")
         return None
     
-    def _is_valid_thumbnail_url(self, url: str) -> bool:
-        """Quick validation for thumbnail URLs"""
-        if not url or len(url) < 20:
-            return False
-        
-        # Must be HTTP/HTTPS
-        if not (url.startswith('http://') or url.startswith('https://')):
-            return False
-        
-        # Must have image extension
-        if not any(ext in url.lower() for ext in ['.jpg', '.jpeg', '.png']):
-            return False
-        
-        # Quick exclude common non-set images
-        exclude_terms = ['logo', 'icon', 'button', 'arrow', 'star', 'flag']
-        if any(term in url.lower() for term in exclude_terms):
-            return False
-        
-        # Reasonable URL length (not too long = likely valid)
-        if len(url) > 300:
-            return False
-        
-        return True
-    
     def _extract_theme_info(self) -> Dict:
         """Extract theme and subtheme information with improved selectors"""
         theme_info = {'theme': 'Not found', 'subtheme': 'Not found'}
         
-        # More specific theme selectors - avoid navigation elements
-        theme_selectors = [
-            # Try to find theme in the breadcrumb or set details area
-            "//*[@id='ContentPlaceHolder1_SetDetails']//*[contains(text(), 'Theme')]/following-sibling::*[1]",
-            # Look for theme in the set information panel
-            "//*[@id='ContentPlaceHolder1_PanelSetFacts']//*[contains(text(), 'Theme')]/following-sibling::*[1]",
-            # Look for breadcrumb theme links
-            "//div[contains(@class, 'breadcrumb')]//a[position()=2]",
-            # Try to find theme in specific data areas only
-            "//*[@class='set-info' or @class='set-details']//*[contains(text(), 'Theme')]/following-sibling::*[1]",
-        ]
-        
-        for selector in theme_selectors:
-            try:
-                element = self.wait_and_find_element(By.XPATH, selector, timeout=1)
-                if element and element.is_displayed():
-                    text = element.text.strip()
-                    # Validate it's actually a theme (not navigation)
-                    if text and len(text) > 2 and len(text) < 50 and '\n' not in text:
-                        # Additional validation - exclude common navigation terms
-                        nav_terms = ['browse', 'deals', 'analysis', 'collection', 'sign', 'region', 'menu']
-                        if not any(term in text.lower() for term in nav_terms):
-                            theme_info['theme'] = text
-                            break
-            except:
-                continue
+        # One pass in the browser instead of a 1s wait per selector that misses
+        try:
+            texts = self.driver.execute_script(_VISIBLE_TEXTS_JS, _THEME_XPATHS)
+        except Exception:
+            texts = []
+        for text in texts:
+            # Validate it's actually a theme (not navigation)
+            if text and len(text) > 2 and len(text) < 50 and '\n' not in text:
+                # Additional validation - exclude common navigation terms
+                if not any(term in text.lower() for term in _NAV_TERMS):
+                    theme_info['theme'] = text
+                    break
         
         return theme_info
 
 def create_lego_database(lego_codes: List[str], headless: bool = True) -> pd.DataFrame:
     """Create comprehensive LEGO database with images"""
     
-    config = Config()
-    config.HEADLESS = headless
-    config.WAIT_TIME = 0.1
+    config = Config(HEADLESS=headless, WAIT_TIME=0.1)
     
     print(f"🏗️ CREATING LEGO DATABASE")
     print(f"📦 Processing {len(lego_codes)} sets with images")
@@ -339,7 +421,9 @@ def create_lego_database(lego_codes: List[str], headless: bool = True) -> pd.Dat
         # Carica i codici già presenti
     existing_codes = get_existing_lego_codes()
 
-    with EnhancedLegoScraper(config) as scraper:
+    # Chrome viene avviato solo se almeno un codice va davvero scaricato
+    needs_browser = any(code not in existing_codes for code in lego_codes)
+    with EnhancedLegoScraper(config) if needs_browser else nullcontext() as scraper:
         for i, code in enumerate(lego_codes, 1):
             if code in existing_codes:
                 print(f"⏩ {code} già presente nel database, salto scraping.")
@@ -383,6 +467,7 @@ def create_lego_database(lego_codes: List[str], headless: bool = True) -> pd.Dat
             if i < len(lego_codes):
                 scraper.driver.get("https://www.brickeconomy.com/")
                 time.sleep(0.1)
+    EnhancedLegoScraper.resolve_image_paths(all_data)
     
     # Se non ci sono nuovi dati, carica dal database
     if not all_data:
@@ -392,15 +477,14 @@ def create_lego_database(lego_codes: List[str], headless: bool = True) -> pd.Dat
         conn.close()
     else:
         df = pd.DataFrame(all_data)
-        # Add some computed fields
-        df['has_image'] = df['image_path'].apply(lambda x: x not in ['Not found', 'Error', None])
-        df['pieces_numeric'] = df['number_of_pieces'].apply(lambda x: 
-            int(''.join(filter(str.isdigit, str(x)))) if x and str(x).replace(',', '').isdigit() else None
-        )
+        # Add some computed fields (vectorized column operations)
+        df['has_image'] = df['image_path'].notna() & ~df['image_path'].isin(['Not found', 'Error'])
+        pieces = df['number_of_pieces'].astype(str).str.replace(',', '', regex=False)
+        df['pieces_numeric'] = pd.to_numeric(pieces.where(pieces.str.isdigit()), errors='coerce').astype('Int64')
     
     elapsed = time.time() - start_time
-    success_count = len(df[df['official_name'].notna() & (df['official_name'] != 'Not found') & (df['official_name'] != 'Error')])
-    images_count = len(df[df['has_image'] == True])
+    success_count = int((df['official_name'].notna() & ~df['official_name'].isin(['Not found', 'Error'])).sum())
+    images_count = int((df['has_image'] == True).sum())
     
     print("\n" + "=" * 60)
     print(f"🎯 DATABASE CREATED in {elapsed:.1f} seconds")
@@ -417,6 +501,8 @@ def export_database(df: pd.DataFrame, format: str = 'all') -> List[str]:
     if format in ['sqlite3', 'all']:
         sqlite_file = f"{base_filename}.db"
         conn = sqlite3.connect(sqlite_file)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
         cursor = conn.cursor()
         # Crea la tabella se non esiste
         cursor.execute("""
@@ -439,20 +525,28 @@ def export_database(df: pd.DataFrame, format: str = 'all') -> List[str]:
                 pieces_numeric INTEGER
             )
         """)
-        # Inserisci solo i nuovi set (evita duplicati)
-        for _, row in df.iterrows():
-            cursor.execute("""
-                INSERT OR REPLACE INTO lego_sets (
-                    lego_code, official_name, number_of_pieces, number_of_minifigs, released, retired,
-                    retail_price_eur, retail_price_gbp, value_new_sealed, value_used, image_url, image_path,
-                    theme, subtheme, has_image, pieces_numeric
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                row['lego_code'], row['official_name'], row['number_of_pieces'], row['number_of_minifigs'],
-                row['released'], row['retired'], row['retail_price_eur'], row['retail_price_gbp'],
-                row['value_new_sealed'], row['value_used'], row['image_url'], row['image_path'],
-                row['theme'], row['subtheme'], int(row['has_image']), row['pieces_numeric']
-            ))
+        # Nei DB creati da DatabaseManager has_image è una colonna generata
+        # (nascosta da pragma_table_info) e non si può scrivere
+        table_columns = {row[0] for row in cursor.execute("SELECT name FROM pragma_table_info('lego_sets')")}
+        columns = [
+            'lego_code', 'official_name', 'number_of_pieces', 'number_of_minifigs', 'released', 'retired',
+            'retail_price_eur', 'retail_price_gbp', 'value_new_sealed', 'value_used', 'image_url', 'image_path',
+            'theme', 'subtheme', 'has_image', 'pieces_numeric'
+        ]
+        if 'has_image' not in table_columns:
+            columns.remove('has_image')
+        # pieces_numeric come int Python (None per i valori mancanti): sqlite3 non accetta pd.NA
+        values = {
+            'has_image': df['has_image'].astype(int),
+            'pieces_numeric': df['pieces_numeric'].astype('Int64').astype(object).where(df['pieces_numeric'].notna(), None)
+        }
+        # Inserisci solo i nuovi set (evita duplicati) - un solo executemany/commit
+        rows = zip(*(values.get(column, df[column]) for column in columns))
+        cursor.executemany(
+            f"INSERT OR REPLACE INTO lego_sets ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})",
+            rows
+        )
         conn.commit()
         output_files.append(sqlite_file)
         print(f"📦 SQLite database: {sqlite_file}")
@@ -473,7 +567,7 @@ def export_database(df: pd.DataFrame, format: str = 'all') -> List[str]:
 def create_html_report(df: pd.DataFrame, filename: str):
     """Create HTML report with images"""
     
-    html_content = """
+    html_parts = ["""
     <!DOCTYPE html>
     <html>
     <head>
@@ -505,14 +599,14 @@ def create_html_report(df: pd.DataFrame, filename: str):
         <div class="container">
         
         <h1>🧱 LEGO Database Report</h1>
-    """
+    """]
     
     # Add summary
     total_sets = len(df)
-    found_sets = len(df[df['official_name'].notna() & (df['official_name'] != 'Not found') & (df['official_name'] != 'Error')])
-    with_images = len(df[df['has_image'] == True])
+    found_sets = int((df['official_name'].notna() & ~df['official_name'].isin(['Not found', 'Error'])).sum())
+    with_images = int((df['has_image'] == True).sum())
     
-    html_content += f"""
+    html_parts.append(f"""
         <div class="summary">
             <h2>📊 Summary</h2>
             <p><strong>Total Sets:</strong> {total_sets}</p>
@@ -521,10 +615,11 @@ def create_html_report(df: pd.DataFrame, filename: str):
         </div>
         
         <h2>📦 LEGO Sets</h2>
-    """
+    """)
     
     # Add each set
-    for _, row in df.iterrows():
+    # to_dict('records') evita di costruire una Series per ogni riga come iterrows()
+    for row in df.to_dict('records'):
         is_found = row['official_name'] not in ['Not found', 'Error', None]
         card_class = "set-card" if is_found else "set-card not-found"
         
@@ -545,7 +640,7 @@ def create_html_report(df: pd.DataFrame, filename: str):
         price = f"💰 {row['retail_price_eur'] or row['retail_price_gbp']}" if (row['retail_price_eur'] and row['retail_price_eur'] != 'Not found') or (row['retail_price_gbp'] and row['retail_price_gbp'] != 'Not found') else ""
         theme = f"🎨 Theme: {row['theme']}" if row['theme'] and row['theme'] != 'Not found' else ""
         
-        html_content += f"""
+        html_parts.append(f"""
             <div class="{card_class}">
                 {image_tag}
                 <div class="set-info">
@@ -557,15 +652,20 @@ def create_html_report(df: pd.DataFrame, filename: str):
                     <div class="set-details">{theme}</div>
                 </div>
             </div>
-        """
+        """)
     
-    html_content += """
+    html_parts.append("""
         </body>
     </html>
-    """
+    """)
     
     with open(filename, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+        f.write(''.join(html_parts))
+
+def parse_lego_codes(codes_text: str) -> List[str]:
+    """Split a comma-separated list of LEGO codes, dropping dots and invalid entries"""
+    codes = (c.strip().replace('.', '') for c in codes_text.split(','))
+    return [c for c in codes if _CODE_RE.fullmatch(c)]
 
 def get_existing_lego_codes(sqlite_file="lego_database/LegoDatabase.db"):
     """Restituisce l'elenco dei lego_code già presenti nel database"""
@@ -573,8 +673,8 @@ def get_existing_lego_codes(sqlite_file="lego_database/LegoDatabase.db"):
         return set()
     conn = sqlite3.connect(sqlite_file)
     try:
-        df = pd.read_sql_query("SELECT lego_code FROM lego_sets", conn)
-        return set(df['lego_code'].tolist())
+        # Only the code column is needed: read it straight off the cursor
+        return {row[0] for row in conn.execute("SELECT lego_code FROM lego_sets")}
     except Exception:
         return set()
     finally:
@@ -588,17 +688,7 @@ def main():
     print("Creates comprehensive database with images")
     print("=" * 50)
 
-    # Lista principale di codici (senza punti)
-    default_codes = [
-        "3920","9469","9470","9471","9472","9473","9474","9476",
-        "10237","10316","10333", "30210","30211","30212","30213",
-        "30215","30216","40630","40631","40632","40693","40751",
-        "50011","71171","71218","71219","71220","79000","79001",
-        "79002","79003","79004","79005","79006","79007","79008",
-        "79010","79011","79012","79013","79014","79015","79016",
-        "79017","79018","5000202","850674","850680","850514",
-        "850515","850516","10367"
-    ]
+    default_codes = list(_DEFAULT_LEGO_CODES)
 
     # Codici aggiuntivi ad-hoc (puoi aggiungere qui in futuro)
     extra_codes = [
@@ -607,7 +697,7 @@ def main():
 
     # Input da terminale o usa default + extra
     if len(sys.argv) > 1:
-        codes = [c.strip().replace('.', '') for c in sys.argv[1].split(',')]
+        codes = parse_lego_codes(sys.argv[1])
     else:
         # Se chiamato dall'interfaccia principale, usa i codici di default senza chiedere input
         try:
@@ -620,7 +710,7 @@ def main():
                     codes = default_codes + extra_codes
                     print(f"Using default codes: {', '.join(codes)}")
                 else:
-                    codes = [c.strip().replace('.', '') for c in codes_input.split(',')] + extra_codes
+                    codes = parse_lego_codes(codes_input) + extra_codes
             else:
                 # Non-interattivo, usa default
                 codes = default_codes + extra_codes
@@ -649,17 +739,8 @@ def update_lego_database_silent():
     print("Creates comprehensive database with images")
     print("=" * 50)
 
-    # Lista principale di codici (senza punti) - usa sempre questi
-    default_codes = [
-        "3920","9469","9470","9471","9472","9473","9474","9476",
-        "10237","10316","10333", "30210","30211","30212","30213",
-        "30215","30216","40630","40631","40632","40693","40751",
-        "50011","71171","71218","71219","71220","79000","79001",
-        "79002","79003","79004","79005","79006","79007","79008",
-        "79010","79011","79012","79013","79014","79015","79016",
-        "79017","79018","5000202","850674","850680","850514",
-        "850515","850516","10367"
-    ]
+    # Usa sempre la lista principale di codici
+    default_codes = list(_DEFAULT_LEGO_CODES)
     
     print(f"Using default codes: {', '.join(default_codes)}")
 
@@ -11,6 +11,9 @@ from datetime import datetime
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+# Records buffered before a file handler is written to; ERROR and above flush at once
+_LOG_BUFFER_CAPACITY = 1024
+
 
 class JsonFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
@@ -87,7 +90,9 @@ class LegoLogger:
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.DEBUG)
         
-        # Clear existing handlers
+        # Clear existing handlers (closing them flushes any buffered records)
+        for handler in self.logger.handlers:
+            handler.close()
         self.logger.handlers.clear()
         
         # Setup handlers
@@ -113,7 +118,7 @@ class LegoLogger:
         general_handler.setFormatter(
             logging.Formatter('%(asctime)s | %(levelname)-8s | %(name)s | %(message)s')
         )
-        self.logger.addHandler(general_handler)
+        self.logger.addHandler(self._buffered(general_handler))
         
         # Debug log file (all levels)
         debug_file = self.log_dir / "debug.log"
@@ -122,7 +127,16 @@ class LegoLogger:
         )
         debug_handler.setLevel(logging.DEBUG)
         debug_handler.setFormatter(JsonFormatter())
-        self.logger.addHandler(debug_handler)
+        self.logger.addHandler(self._buffered(debug_handler))
+    
+    @staticmethod
+    def _buffered(handler: logging.Handler) -> logging.Handler:
+        """Wrap a file handler so records are written in batches instead of one by one"""
+        memory_handler = logging.handlers.MemoryHandler(
+            _LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=handler
+        )
+        memory_handler.setLevel(handler.level)
+        return memory_handler
     
     def _setup_error_handler(self):
         """Setup error-only handler with JSON format"""
@@ -17,22 +17,53 @@ import socketserver
 import threading
 from urllib.parse import urlparse, parse_qs
 
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
 # Import enhanced modules
-from database_manager import get_database_manager, DatabaseStats
+from database_manager import get_database_manager, DatabaseStats, dump_json
 from logging_system import setup_logging, get_logger
 from exceptions import DatabaseError, handle_exception
 
-# Import the existing modules
-from lego_database import main as lego_main, create_lego_database, export_database, update_lego_database_silent
-from minifig_database import main as minifig_main, create_minifig_database, export_minifig_database
-
-# Import enhanced web generator
-from enhanced_web_generator import generate_enhanced_web_interface
+# Gli scraper (Selenium/webdriver-manager) e il generatore web vengono importati
+# solo nelle voci di menu che li usano, così l'avvio del menu resta rapido
 
 # Setup enhanced logging
 logger_system = setup_logging("LegoMainInterface")
 logger = get_logger(__name__)
 
+# Non-interactive mode (--non-interactive or LEGO_NONINTERACTIVE=1): menu choices are
+# read from stdin without the "Press Enter" pauses, so runs can be scripted and timed
+_INTERACTIVE = os.getenv("LEGO_NONINTERACTIVE") != "1" and "--non-interactive" not in sys.argv
+
+# API connections, opened on first request and reused by every later one
+_API_CONNECTIONS = {}
+
+def _get_api_conn(db_path):
+    """Return the shared API connection for db_path, opening it on first use"""
+    conn = _API_CONNECTIONS.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=256)
+        # WAL lets the API read while a scrape is writing
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        _API_CONNECTIONS[db_path] = conn
+    return conn
+
+def _fetch_records(conn, query, params=()):
+    """Run an API query and return its rows as dicts (image paths relative to lego_database/)"""
+    cursor = conn.execute(query, params)
+    columns = [column[0] for column in cursor.description]
+    records = [dict(zip(columns, row)) for row in cursor]
+    # Fix image paths - remove 'lego_database/' prefix since server is already in that directory
+    if 'image_path' in columns:
+        for record in records:
+            if record['image_path']:
+                record['image_path'] = record['image_path'].replace('lego_database/', '').replace('lego_database\\', '')
+    return records
+
 
 class LegoAPIHandler(http.server.SimpleHTTPRequestHandler):
     """Custom HTTP handler for serving LEGO database API"""
@@ -54,6 +85,8 @@ class LegoAPIHandler(http.server.SimpleHTTPRequestHandler):
             self.serve_sets_data(query_params)
         elif parsed_path.path == '/api/minifigs':
             self.serve_minifigs_data(query_params)
+        elif parsed_path.path == '/matrix_data.json' and self.serve_precompressed('matrix_data.json'):
+            pass
         else:
             # Serve static files
             super().do_GET()
@@ -69,11 +102,29 @@ class LegoAPIHandler(http.server.SimpleHTTPRequestHandler):
         else:
             self.send_error(404, "Endpoint not found")
     
+    def serve_precompressed(self, filename):
+        """Serve the pre-gzipped copy of a static JSON file if the client accepts gzip"""
+        gz_path = f"{filename}.gz"
+        if 'gzip' not in self.headers.get('Accept-Encoding', '') or not os.path.exists(gz_path):
+            return False
+        
+        with open(gz_path, 'rb') as f:
+            body = f.read()
+        
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+        self.wfile.write(body)
+        return True
+    
     def serve_matrix_data(self):
         """Serve matrix data from SQLite database"""
         try:
             # Connect to database
-            conn = sqlite3.connect(self.db_path)
+            conn = _get_api_conn(self.db_path)
             
             # Get sets data
             sets_query = """
@@ -82,8 +133,7 @@ class LegoAPIHandler(http.server.SimpleHTTPRequestHandler):
                 WHERE lego_code IS NOT NULL AND official_name IS NOT NULL
                 ORDER BY lego_code
             """
-            sets_df = pd.read_sql_query(sets_query, conn)
-            sets = sets_df.to_dict('records')
+            sets = _fetch_records(conn, sets_query)
             
             # Get minifigs data  
             minifigs_query = """
@@ -92,8 +142,7 @@ class LegoAPIHandler(http.server.SimpleHTTPRequestHandler):
                 WHERE minifig_code IS NOT NULL AND official_name IS NOT NULL
                 ORDER BY minifig_code
             """
-            minifigs_df = pd.read_sql_query(minifigs_query, conn)
-            minifigs = minifigs_df.to_dict('records')
+            minifigs = _fetch_records(conn, minifigs_query)
             
             # Get connections data
             connections_query = """
@@ -101,10 +150,7 @@ class LegoAPIHandler(http.server.SimpleHTTPRequestHandler):
                 FROM set_minifig_relations
                 WHERE minifig_code IS NOT NULL AND set_code IS NOT NULL
             """
-            connections_df = pd.read_sql_query(connections_query, conn)
-            connections = connections_df.to_dict('records')
-            
-            conn.close()
+            connections = _fetch_records(conn, connections_query)
             
             # Create response data
             matrix_data = {
@@ -137,7 +183,7 @@ class LegoAPIHandler(http.server.SimpleHTTPRequestHandler):
             theme = query_params.get('theme', [''])[0]
             
             # Connect to database
-            conn = sqlite3.connect(self.db_path)
+            conn = _get_api_conn(self.db_path)
             
             results = {
                 'sets': [],
@@ -167,8 +213,7 @@ class LegoAPIHandler(http.server.SimpleHTTPRequestHandler):
                 
                 sets_query += " ORDER BY lego_code LIMIT 50"
                 
-                sets_df = pd.read_sql_query(sets_query, conn, params=params)
-                results['sets'] = sets_df.to_dict('records')
+                results['sets'] = _fetch_records(conn, sets_query, params)
             
             # Search in minifigs if category allows
             if category in ['', 'minifigs']:
@@ -192,10 +237,7 @@ class LegoAPIHandler(http.server.SimpleHTTPRequestHandler):
                 
                 minifigs_query += " ORDER BY minifig_code LIMIT 50"
                 
-                minifigs_df = pd.read_sql_query(minifigs_query, conn, params=params)
-                results['minifigs'] = minifigs_df.to_dict('records')
-            
-            conn.close()
+                results['minifigs'] = _fetch_records(conn, minifigs_query, params)
             
             # Calculate total results
             results['total_results'] = len(results['sets']) + len(results['minifigs'])
@@ -224,7 +266,7 @@ class LegoAPIHandler(http.server.SimpleHTTPRequestHandler):
         """Serve sets data with owned status"""
         try:
             # Connect to database
-            conn = sqlite3.connect(self.db_path)
+            conn = _get_api_conn(self.db_path)
             
             # Get sets data with owned status
             sets_query = """
@@ -236,16 +278,7 @@ class LegoAPIHandler(http.server.SimpleHTTPRequestHandler):
                 ORDER BY lego_code
             """
             
-            sets_df = pd.read_sql_query(sets_query, conn)
-            
-            # Fix image paths - remove 'lego_database/' prefix since server is already in that directory
-            if 'image_path' in sets_df.columns:
-                sets_df['image_path'] = sets_df['image_path'].str.replace('lego_database/', '', regex=False)
-                sets_df['image_path'] = sets_df['image_path'].str.replace('lego_database\\', '', regex=False)
-            
-            sets = sets_df.to_dict('records')
-            
-            conn.close()
+            sets = _fetch_records(conn, sets_query)
             
             # Send JSON response
             self.send_response(200)
@@ -278,7 +311,7 @@ class LegoAPIHandler(http.server.SimpleHTTPRequestHandler):
                 return
             
             # Connect to database and update
-            conn = sqlite3.connect(self.db_path)
+            conn = _get_api_conn(self.db_path)
             cursor = conn.cursor()
             
             cursor.execute(
@@ -287,12 +320,11 @@ class LegoAPIHandler(http.server.SimpleHTTPRequestHandler):
             )
             
             if cursor.rowcount == 0:
-                conn.close()
+                conn.rollback()  # shared connection: don't leave the write transaction open
                 self.send_error(404, f"Set {lego_code} not found")
                 return
                 
             conn.commit()
-            conn.close()
             
             # Send success response
             self.send_response(200)
@@ -321,7 +353,7 @@ class LegoAPIHandler(http.server.SimpleHTTPRequestHandler):
         """Serve minifigs data with owned status"""
         try:
             # Connect to database
-            conn = sqlite3.connect(self.db_path)
+            conn = _get_api_conn(self.db_path)
             
             # Get minifigs data with owned status
             minifigs_query = """
@@ -332,16 +364,7 @@ class LegoAPIHandler(http.server.SimpleHTTPRequestHandler):
                 ORDER BY minifig_code
             """
             
-            minifigs_df = pd.read_sql_query(minifigs_query, conn)
-            
-            # Fix image paths - remove 'lego_database/' prefix since server is already in that directory
-            if 'image_path' in minifigs_df.columns:
-                minifigs_df['image_path'] = minifigs_df['image_path'].str.replace('lego_database/', '', regex=False)
-                minifigs_df['image_path'] = minifigs_df['image_path'].str.replace('lego_database\\', '', regex=False)
-            
-            minifigs = minifigs_df.to_dict('records')
-            
-            conn.close()
+            minifigs = _fetch_records(conn, minifigs_query)
             
             # Send JSON response
             self.send_response(200)
@@ -374,7 +397,7 @@ class LegoAPIHandler(http.server.SimpleHTTPRequestHandler):
                 return
             
             # Connect to database and update
-            conn = sqlite3.connect(self.db_path)
+            conn = _get_api_conn(self.db_path)
             cursor = conn.cursor()
             
             cursor.execute(
@@ -383,12 +406,11 @@ class LegoAPIHandler(http.server.SimpleHTTPRequestHandler):
             )
             
             if cursor.rowcount == 0:
-                conn.close()
+                conn.rollback()  # shared connection: don't leave the write transaction open
                 self.send_error(404, f"Minifig {minifig_code} not found")
                 return
                 
             conn.commit()
-            conn.close()
             
             # Send success response
             self.send_response(200)
@@ -498,17 +520,25 @@ class EnhancedLegoUnifiedDatabase:
             with sqlite3.connect(self.db_path) as conn:
                 stats = {}
                 
-                # LEGO Sets stats
+                # LEGO Sets stats (aggregated in SQL: only the counts are needed)
                 try:
-                    sets_df = pd.read_sql_query("SELECT * FROM lego_sets", conn)
+                    has_pieces = conn.execute(
+                        "SELECT 1 FROM pragma_table_info('lego_sets') WHERE name = 'pieces_numeric'"
+                    ).fetchone() is not None
+                    total, found, with_images, themes, total_pieces = conn.execute(f"""
+                        SELECT COUNT(*),
+                               COALESCE(SUM(official_name IS NOT NULL AND official_name NOT IN ('Not found', 'Error')), 0),
+                               COALESCE(SUM(has_image = 1), 0),
+                               COUNT(DISTINCT CASE WHEN theme != 'Not found' THEN theme END),
+                               {'COALESCE(SUM(pieces_numeric), 0)' if has_pieces else '0'}
+                        FROM lego_sets
+                    """).fetchone()
                     stats['sets'] = {
-                        'total': len(sets_df),
-                        'found': len(sets_df[(sets_df['official_name'].notna()) & 
-                                           (sets_df['official_name'] != 'Not found') & 
-                                           (sets_df['official_name'] != 'Error')]),
-                        'with_images': len(sets_df[sets_df['has_image'] == 1]),
-                        'themes': sets_df[sets_df['theme'].notna() & (sets_df['theme'] != 'Not found')]['theme'].nunique(),
-                        'total_pieces': sets_df['pieces_numeric'].sum() if 'pieces_numeric' in sets_df.columns else 0,
+                        'total': total,
+                        'found': found,
+                        'with_images': with_images,
+                        'themes': themes,
+                        'total_pieces': total_pieces,
                         'last_updated': 'Unknown'
                     }
                 except Exception as e:
@@ -517,14 +547,18 @@ class EnhancedLegoUnifiedDatabase:
                 
                 # Minifigs stats
                 try:
-                    minifig_df = pd.read_sql_query("SELECT * FROM minifig", conn)
+                    total, found, with_images, unique_years = conn.execute("""
+                        SELECT COUNT(*),
+                               COALESCE(SUM(official_name IS NOT NULL AND official_name NOT IN ('Not found', 'Error')), 0),
+                               COALESCE(SUM(has_image = 1), 0),
+                               COUNT(DISTINCT CASE WHEN year != 'Not found' THEN year END)
+                        FROM minifig
+                    """).fetchone()
                     stats['minifigs'] = {
-                        'total': len(minifig_df),
-                        'found': len(minifig_df[(minifig_df['official_name'].notna()) & 
-                                              (minifig_df['official_name'] != 'Not found') & 
-                                              (minifig_df['official_name'] != 'Error')]),
-                        'with_images': len(minifig_df[minifig_df['has_image'] == 1]),
-                        'unique_years': minifig_df[minifig_df['year'].notna() & (minifig_df['year'] != 'Not found')]['year'].nunique(),
+                        'total': total,
+                        'found': found,
+                        'with_images': with_images,
+                        'unique_years': unique_years,
                         'last_updated': 'Unknown'
                     }
                 except Exception as e:
@@ -561,6 +595,17 @@ class EnhancedLegoUnifiedDatabase:
             raise
 
 
+def _existing_columns(conn, table, wanted):
+    """Return the columns of wanted that table actually has (generated ones included)"""
+    present = {row[0] for row in conn.execute("SELECT name FROM pragma_table_xinfo(?)", (table,))}
+    return [column for column in wanted if column in present]
+
+
+def _found_count(names):
+    """Count the names that were actually scraped (not missing, 'Not found' or 'Error')"""
+    return int((names.notna() & ~names.isin(('Not found', 'Error'))).sum())
+
+
 def view_detailed_analytics():
     """Display detailed analytics and breakdowns"""
     db = EnhancedLegoUnifiedDatabase()
@@ -570,29 +615,31 @@ def view_detailed_analytics():
         with sqlite3.connect(db.db_path) as conn:
             detailed_stats = {}
             
-            # LEGO Sets detailed analysis
-            sets_df = pd.read_sql_query("SELECT * FROM lego_sets", conn)
+            # LEGO Sets detailed analysis (solo le colonne usate qui sotto)
+            set_columns = _existing_columns(conn, 'lego_sets', ('theme', 'released', 'official_name', 'pieces_numeric'))
+            sets_df = pd.read_sql_query(f"SELECT {', '.join(set_columns)} FROM lego_sets", conn)
             if not sets_df.empty:
                 detailed_stats['sets'] = {
-                    'by_theme': sets_df[sets_df['theme'].notna() & (sets_df['theme'] != 'Not found')]['theme'].value_counts().to_dict(),
-                    'by_year': sets_df[sets_df['released'].notna()]['released'].value_counts().head(10).to_dict(),
+                    'by_theme': sets_df['theme'].value_counts().drop('Not found', errors='ignore').to_dict(),
+                    'by_year': sets_df['released'].value_counts().head(10).to_dict(),
                     'piece_distribution': {
                         'min': sets_df['pieces_numeric'].min() if 'pieces_numeric' in sets_df.columns else 0,
                         'max': sets_df['pieces_numeric'].max() if 'pieces_numeric' in sets_df.columns else 0,
                         'avg': sets_df['pieces_numeric'].mean() if 'pieces_numeric' in sets_df.columns else 0
                     },
-                    'completion_rate': len(sets_df[sets_df['official_name'].notna() & (sets_df['official_name'] != 'Not found') & (sets_df['official_name'] != 'Error')]) / len(sets_df) * 100 if len(sets_df) > 0 else 0
+                    'completion_rate': _found_count(sets_df['official_name']) / len(sets_df) * 100 if len(sets_df) > 0 else 0
                 }
             else:
                 detailed_stats['sets'] = {'by_theme': {}, 'by_year': {}, 'piece_distribution': {}, 'completion_rate': 0}
             
             # Minifigs detailed analysis
-            minifig_df = pd.read_sql_query("SELECT * FROM minifig", conn)
+            minifig_columns = _existing_columns(conn, 'minifig', ('year', 'theme', 'official_name'))
+            minifig_df = pd.read_sql_query(f"SELECT {', '.join(minifig_columns)} FROM minifig", conn)
             if not minifig_df.empty:
                 detailed_stats['minifigs'] = {
-                    'by_year': minifig_df[minifig_df['year'].notna()]['year'].value_counts().to_dict(),
-                    'by_theme': minifig_df[minifig_df['theme'].notna() & (minifig_df['theme'] != 'Not found')]['theme'].value_counts().to_dict(),
-                    'completion_rate': len(minifig_df[minifig_df['official_name'].notna() & (minifig_df['official_name'] != 'Not found') & (minifig_df['official_name'] != 'Error')]) / len(minifig_df) * 100 if len(minifig_df) > 0 else 0
+                    'by_year': minifig_df['year'].value_counts().to_dict(),
+                    'by_theme': minifig_df['theme'].value_counts().drop('Not found', errors='ignore').to_dict(),
+                    'completion_rate': _found_count(minifig_df['official_name']) / len(minifig_df) * 100 if len(minifig_df) > 0 else 0
                 }
             else:
                 detailed_stats['minifigs'] = {'by_year': {}, 'by_theme': {}, 'completion_rate': 0}
@@ -1301,60 +1348,64 @@ def export_data():
     print("4. 🌐 Regenerate HTML reports")
     
     choice = input("Select export format: ").strip()
+    if choice not in ("1", "2", "3", "4"):
+        print("❌ Invalid option")
+        return
     
+    # Le tabelle vengono lette una sola volta e condivise da tutti i formati
     with sqlite3.connect(db.db_path) as conn:
-        if choice == "1":
-            # CSV Export
-            sets_df = pd.read_sql_query("SELECT * FROM lego_sets", conn)
-            minifig_df = pd.read_sql_query("SELECT * FROM minifig", conn)
-            
-            sets_df.to_csv("lego_database/lego_sets.csv", index=False)
-            minifig_df.to_csv("lego_database/minifigures.csv", index=False)
-            print("✅ Data exported to CSV files")
-            
-        elif choice == "2":
-            # JSON Export
-            sets_df = pd.read_sql_query("SELECT * FROM lego_sets", conn)
-            minifig_df = pd.read_sql_query("SELECT * FROM minifig", conn)
-            
-            sets_df.to_json("lego_database/lego_sets.json", orient="records", indent=2)
-            minifig_df.to_json("lego_database/minifigures.json", orient="records", indent=2)
-            print("✅ Data exported to JSON files")
-            
-        elif choice == "3":
-            # Excel Export
-            try:
-                sets_df = pd.read_sql_query("SELECT * FROM lego_sets", conn)
-                minifig_df = pd.read_sql_query("SELECT * FROM minifig", conn)
-                
-                with pd.ExcelWriter("lego_database/lego_database.xlsx", engine='openpyxl') as writer:
-                    sets_df.to_excel(writer, sheet_name='LEGO_Sets', index=False)
-                    minifig_df.to_excel(writer, sheet_name='Minifigures', index=False)
-                print("✅ Data exported to Excel file")
-            except ImportError:
-                print("❌ Excel export requires openpyxl. Install with: pip install openpyxl")
-                
-        elif choice == "4":
-            # Regenerate HTML reports
-            from lego_database import create_html_report
-            from minifig_database import create_minifig_html_report
-            
-            sets_df = pd.read_sql_query("SELECT * FROM lego_sets", conn)
-            minifig_df = pd.read_sql_query("SELECT * FROM minifig", conn)
-            
-            create_html_report(sets_df, "lego_database/LegoDatabase.html")
-            create_minifig_html_report(minifig_df, "lego_database/LegoDatabase_Minifig.html")
-            print("✅ HTML reports regenerated")
+        sets_df = pd.read_sql_query("SELECT * FROM lego_sets", conn)
+        minifig_df = pd.read_sql_query("SELECT * FROM minifig", conn)
+    
+    if choice == "1":
+        # CSV Export
+        sets_df.to_csv("lego_database/lego_sets.csv", index=False)
+        minifig_df.to_csv("lego_database/minifigures.csv", index=False)
+        print("✅ Data exported to CSV files")
+        
+    elif choice == "2":
+        # JSON Export
+        # orjson (se installato) serializza i record molto più velocemente di to_json;
+        # i NaN diventano None così l'output resta JSON valido anche col fallback json
+        for df, path in ((sets_df, "lego_database/lego_sets.json"), (minifig_df, "lego_database/minifigures.json")):
+            records = df.astype(object).where(df.notna(), None).to_dict('records')
+            with open(path, 'wb') as f:
+                f.write(dump_json(records))
+        print("✅ Data exported to JSON files")
+        
+    elif choice == "3":
+        # Excel Export
+        try:
+            # xlsxwriter is faster than openpyxl, which stays as fallback. No constant_memory:
+            # to_excel writes column by column and that mode drops cells of past rows
+            engine = 'xlsxwriter' if xlsxwriter is not None else 'openpyxl'
+            with pd.ExcelWriter("lego_database/lego_database.xlsx", engine=engine) as writer:
+                sets_df.to_excel(writer, sheet_name='LEGO_Sets', index=False)
+                minifig_df.to_excel(writer, sheet_name='Minifigures', index=False)
+            print("✅ Data exported to Excel file")
+        except ImportError:
+            print("❌ Excel export requires xlsxwriter or openpyxl. Install with: pip install xlsxwriter")
+            
+    elif choice == "4":
+        # Regenerate HTML reports
+        from lego_database import create_html_report
+        from minifig_database import create_minifig_html_report
+        
+        create_html_report(sets_df, "lego_database/LegoDatabase.html")
+        create_minifig_html_report(minifig_df, "lego_database/LegoDatabase_Minifig.html")
+        print("✅ HTML reports regenerated")
 
 def create_advanced_analytics_page():
     """Create an advanced analytics dashboard"""
     db = EnhancedLegoUnifiedDatabase()
     
     with sqlite3.connect(db.db_path) as conn:
-        # Get data for analytics
+        # Get data for analytics (solo le colonne usate nei grafici)
         try:
-            sets_df = pd.read_sql_query("SELECT * FROM lego_sets", conn)
-            minifig_df = pd.read_sql_query("SELECT * FROM minifig", conn)
+            set_columns = _existing_columns(conn, 'lego_sets', ('theme', 'retail_price_eur', 'official_name', 'has_image'))
+            minifig_columns = _existing_columns(conn, 'minifig', ('year', 'official_name', 'has_image'))
+            sets_df = pd.read_sql_query(f"SELECT {', '.join(set_columns)} FROM lego_sets", conn)
+            minifig_df = pd.read_sql_query(f"SELECT {', '.join(minifig_columns)} FROM minifig", conn)
         except:
             sets_df = pd.DataFrame()
             minifig_df = pd.DataFrame()
@@ -1369,36 +1420,28 @@ def create_advanced_analytics_page():
     }
     
     if not sets_df.empty:
-        # Theme analysis
-        theme_counts = sets_df[sets_df['theme'].notna() & (sets_df['theme'] != 'Not found')]['theme'].value_counts()
+        # Theme analysis (value_counts scarta già i NaN)
+        theme_counts = sets_df['theme'].value_counts().drop('Not found', errors='ignore')
         analytics['sets_by_theme'] = theme_counts.head(10).to_dict()
         
-        # Price analysis
-        valid_prices = sets_df[sets_df['retail_price_eur'].notna() & (sets_df['retail_price_eur'] != 'Not found')]
-        if not valid_prices.empty:
-            # Extract numeric prices
-            numeric_prices = []
-            for price in valid_prices['retail_price_eur']:
-                try:
-                    # Extract numbers from price string
-                    import re
-                    matches = re.findall(r'[\d.]+', str(price))
-                    if matches:
-                        numeric_prices.append(float(matches[0]))
-                except:
-                    continue
-            
-            if numeric_prices:
-                analytics['price_analysis'] = {
-                    'average': sum(numeric_prices) / len(numeric_prices),
-                    'min': min(numeric_prices),
-                    'max': max(numeric_prices),
-                    'count': len(numeric_prices)
-                }
+        # Price analysis: primo numero della stringa, vettorizzato.
+        # NaN e 'Not found' non contengono cifre e vengono scartati da dropna()
+        numeric_prices = pd.to_numeric(
+            sets_df['retail_price_eur'].astype(str).str.extract(r'([\d.]+)', expand=False),
+            errors='coerce'
+        ).dropna()
+        
+        if not numeric_prices.empty:
+            analytics['price_analysis'] = {
+                'average': float(numeric_prices.mean()),
+                'min': float(numeric_prices.min()),
+                'max': float(numeric_prices.max()),
+                'count': int(numeric_prices.size)
+            }
     
     if not minifig_df.empty:
         # Year analysis for minifigs
-        year_counts = minifig_df[minifig_df['year'].notna()]['year'].value_counts()
+        year_counts = minifig_df['year'].value_counts()
         analytics['minifig_trends'] = year_counts.head(10).to_dict()
     
     # Create analytics HTML
@@ -1687,12 +1730,17 @@ def main():
     
     while True:
         show_menu()  # Now includes stats in the menu
-        choice = input("\n🎯 Select option: ").strip()
+        try:
+            choice = input("\n🎯 Select option: ").strip()
+        except EOFError:
+            # stdin esaurito (esecuzione non interattiva): esci
+            choice = "0"
         
         if choice == "1":
             print("\n📦 GENERATING/UPDATING LEGO SETS DATABASE")
             print("=" * 50)
             try:
+                from lego_database import update_lego_database_silent
                 update_lego_database_silent()  # Usa la versione silente
                 print("✅ LEGO sets database updated successfully!")
                 # Show updated stats
@@ -1707,6 +1755,7 @@ def main():
             print("\n🧑‍🚀 GENERATING/UPDATING MINIFIGURES DATABASE")
             print("=" * 50)
             try:
+                from minifig_database import main as minifig_main
                 minifig_main()
                 print("✅ Minifigures database updated successfully!")
                 # Show updated stats
@@ -1719,6 +1768,8 @@ def main():
             print("\n🔄 UPDATING BOTH DATABASES")
             print("=" * 50)
             try:
+                from lego_database import main as lego_main
+                from minifig_database import main as minifig_main
                 print("📦 Updating LEGO sets...")
                 lego_main()
                 print("\n🧑‍🚀 Updating minifigures...")
@@ -1735,6 +1786,7 @@ def main():
             print("=" * 50)
             try:
                 # Generate enhanced web interface (index.html + sets.html)
+                from enhanced_web_generator import generate_enhanced_web_interface
                 generate_enhanced_web_interface()
                 print("✅ Enhanced main page and sets page created")
                 
@@ -1813,7 +1865,8 @@ def main():
         else:
             print("❌ Invalid option. Please try again.")
         
-        input("\n📱 Press Enter to continue...")
+        if _INTERACTIVE:
+            input("\n📱 Press Enter to continue...")
 
 if __name__ == "__main__":
     main()
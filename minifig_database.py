@@ -1,23 +1,130 @@
 # --- Fixed version of minifig scraper ---
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import pandas as pd
 from PIL import Image
-from io import BytesIO
+from io import BytesIO, StringIO
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import re
 import sqlite3
+import sys
+
+# Pinned ChromeDriver binary; when unset Selenium Manager locates one on every start
+_DRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH")
+
+# Page text patterns, compiled once
+_SITE_SUFFIX_RE = re.compile(r'\s*\|\s*BrickEconomy.*')
+_MINIFIGURE_RE = re.compile(r'\s*Minifigure\s*')
+# "Theme" already covers "theme" case-insensitively; "Series" is the fallback
+_THEME_PATTERNS = (
+    re.compile(r'Theme[:\s]*([^<\n\r]+)', re.IGNORECASE),
+    re.compile(r'Series[:\s]*([^<\n\r]+)', re.IGNORECASE),
+)
+_YEAR_RE = re.compile(r"\d{4}")
+# Valid minifig codes: letters, digits, dashes and underscores only (e.g. lor001)
+_MINIFIG_CODE_RE = re.compile(r'[A-Za-z0-9_-]+')
+_GBP_PRICE_RE = re.compile(r"£\s?(\d+\.?\d*)")
+
+# Codici di default: range automatico lor001-lor153 (lor108 non è una minifig) + codici ad-hoc
+_DEFAULT_MINIFIG_CODES = tuple(f"lor{i:03d}" for i in range(1, 154) if i != 108) + (
+    "dim001", "dim007", "dim008"
+    # aggiungi altri codici qui
+)
+
+# Per-element diagnostics (tables, links, image checks) only when DEBUG_VERBOSE is set
+_VERBOSE = bool(os.environ.get("DEBUG_VERBOSE"))
+
+# Resources the scraper never needs the browser to fetch: image URLs are read
+# from the DOM and downloaded separately
+_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg",
+    "*.woff", "*.woff2", "*.ttf",
+    "*googletagmanager*", "*google-analytics*", "*doubleclick*",
+]
+
+# Selectors tried in order for the minifig name ("title" means the page title)
+_NAME_SELECTORS = (
+    "h1",
+    ".minifig-title",
+    "[data-testid='minifig-name']",
+    ".page-title",
+    "title"
+)
+
+# Image selectors in priority order; the code-specific one goes in between
+_IMAGE_SELECTORS_HEAD = (
+    "img[src*='minifig']",
+    "img[src*='lor001']",
+)
+_IMAGE_SELECTORS_TAIL = (
+    "img[alt*='minifig']",
+    "img[alt*='LEGO']",
+    ".minifig-image img",
+    ".product-image img",
+    "img"
+)
+_IMAGE_SKIP_TERMS = ('logo', 'icon', 'banner', 'header')
+
+# [label, value] text of every ".row.rowlist" row that has exactly two cells
+_FACT_ROWS_JS = """
+var facts = [];
+document.querySelectorAll('.row.rowlist').forEach(function (row) {
+    var cells = row.querySelectorAll('div');
+    if (cells.length === 2) {
+        facts.push([cells[0].innerText.trim(), cells[1].innerText.trim()]);
+    }
+});
+return facts;
+"""
+
+# Candidate image URLs for a minifig, filtered in the browser and returned in
+# selector priority order: src or alt mentions the minifig, or a plain image
+# file that is not site chrome (logo, icon, banner, header)
+_IMAGE_CANDIDATES_JS = """
+var selectors = arguments[0], code = arguments[1].toLowerCase(), skip = arguments[2];
+var seen = {}, candidates = [];
+selectors.forEach(function (selector) {
+    var images;
+    try {
+        images = document.querySelectorAll(selector);
+    } catch (e) {
+        return;
+    }
+    images.forEach(function (img) {
+        var src = img.src || '', lower = src.toLowerCase(), alt = (img.alt || '').toLowerCase();
+        if (!src || seen[src]) {
+            return;
+        }
+        if (lower.indexOf('minifig') >= 0 || lower.indexOf(code) >= 0 || alt.indexOf('minifig') >= 0 ||
+                (/\\.(jpg|jpeg|png|webp)$/.test(src) &&
+                 !skip.some(function (term) { return lower.indexOf(term) >= 0; }))) {
+            seen[src] = true;
+            candidates.push(src);
+        }
+    });
+});
+return candidates;
+"""
 
 class MinifigImageDatabase:
     def __init__(self):
         self.images_dir = "lego_database/images"
         os.makedirs(self.images_dir, exist_ok=True)
+        # One keep-alive session for every image: TCP/TLS handshakes are reused
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        adapter = HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
     def download_image(self, minifig_code, image_url):
         if not image_url:
@@ -26,10 +133,7 @@ class MinifigImageDatabase:
         if os.path.exists(path):
             return path
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            r = requests.get(image_url, timeout=10, headers=headers)
+            r = self.session.get(image_url, timeout=10)
             r.raise_for_status()
             img = Image.open(BytesIO(r.content)).convert('RGB')
             img.thumbnail((400, 400))
@@ -50,10 +154,18 @@ class EnhancedMinifigScraper:
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
         chrome_options.add_argument("--window-size=1920,1080")
+        # Return from driver.get() at DOMContentLoaded: the scraper only reads the DOM
+        chrome_options.page_load_strategy = 'eager'
         chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
         
-        self.driver = webdriver.Chrome(options=chrome_options)
+        service = Service(_DRIVER_PATH) if _DRIVER_PATH else None
+        self.driver = webdriver.Chrome(options=chrome_options, service=service)
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URLS})
+        except Exception:
+            pass  # CDP non disponibile: carica la pagina completa
         self.wait = WebDriverWait(self.driver, 10)
         self.img_db = MinifigImageDatabase()
 
@@ -93,7 +205,11 @@ class EnhancedMinifigScraper:
         
         try:
             self.driver.get(url)
-            time.sleep(3)  # Wait for page to load
+            # Attendi il titolo della pagina invece di una pausa fissa
+            try:
+                self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "h1")))
+            except TimeoutException:
+                pass
             
             # Check if page exists by looking for title
             page_title = self.driver.title
@@ -104,17 +220,8 @@ class EnhancedMinifigScraper:
 
             # Extract name from page title or h1
             try:
-                # Try multiple selectors for the name
-                name_selectors = [
-                    "h1",
-                    ".minifig-title",
-                    "[data-testid='minifig-name']",
-                    ".page-title",
-                    "title"
-                ]
-                
                 name = ""
-                for selector in name_selectors:
+                for selector in _NAME_SELECTORS:
                     try:
                         if selector == "title":
                             name = self.driver.title
@@ -129,8 +236,8 @@ class EnhancedMinifigScraper:
                 # Clean up the name
                 if name:
                     # Remove common suffixes
-                    name = re.sub(r'\s*\|\s*BrickEconomy.*', '', name)
-                    name = re.sub(r'\s*Minifigure\s*', '', name)
+                    name = _SITE_SUFFIX_RE.sub('', name)
+                    name = _MINIFIGURE_RE.sub('', name)
                     #name = re.sub(r'\s*LEGO\s*', '', name, flags=re.IGNORECASE)
                     name = name.strip()
                     data['official_name'] = name
@@ -146,14 +253,8 @@ class EnhancedMinifigScraper:
                 page_source = self.driver.page_source
                 
                 # Look for theme information
-                theme_patterns = [
-                    r'Theme[:\s]*([^<\n\r]+)',
-                    r'theme[:\s]*([^<\n\r]+)',
-                    r'Series[:\s]*([^<\n\r]+)',
-                ]
-                
-                for pattern in theme_patterns:
-                    match = re.search(pattern, page_source, re.IGNORECASE)
+                for pattern in _THEME_PATTERNS:
+                    match = pattern.search(page_source)
                     if match:
                         theme = match.group(1).strip()
                         if len(theme) < 50:  # Reasonable theme name length
@@ -161,77 +262,40 @@ class EnhancedMinifigScraper:
                             break
 
                 
-                # Look for year information
-                rows = self.driver.find_elements(By.CSS_SELECTOR, ".row.rowlist")
-                for row in rows:
-                    cells = row.find_elements(By.CSS_SELECTOR, "div")
-                    if len(cells) == 2:
-                        label = cells[0].text.strip().lower()
-                        value = cells[1].text.strip()
-                        # Estrai l'anno
-                        if label == "year" and re.match(r"\d{4}", value):
-                            data['year'] = value
-                        # Estrai la data di rilascio (mese e anno)
-                        if label == "released" and value:
-                            data['released'] = value
-                        
-                
-                # Look for price information in USD first, then convert mentally to GBP
-                rows = self.driver.find_elements(By.CSS_SELECTOR, ".row.rowlist")
-                for row in rows:
-                    cells = row.find_elements(By.CSS_SELECTOR, "div")
-                    if len(cells) == 2:
-                        label = cells[0].text.strip().lower()
-                        value = cells[1].text.strip()
-                        # Estrai prezzo se label contiene "value"
-                        if "value" in label:
-                            match = re.search(r"£\s?(\d+\.?\d*)", value)
-                            if match:
-                                data['retail_price_gbp'] = match.group(1)
+                # Label/value pairs of the facts list, only rows with exactly two
+                # cells, read in one WebDriver call
+                facts = self.driver.execute_script(_FACT_ROWS_JS)
+                for label, value in facts:
+                    label = label.lower()
+                    # Estrai l'anno
+                    if label == "year" and _YEAR_RE.match(value):
+                        data['year'] = value
+                    # Estrai la data di rilascio (mese e anno)
+                    if label == "released" and value:
+                        data['released'] = value
+                    # Estrai prezzo se label contiene "value"
+                    if "value" in label:
+                        match = _GBP_PRICE_RE.search(value)
+                        if match:
+                            data['retail_price_gbp'] = match.group(1)
 
             except Exception as e:
                 print(f"   ⚠️ Error extracting details: {e}")
 
             # Try to find and download image
             try:
-                # Look for images with various selectors
-                image_selectors = [
-                    "img[src*='minifig']",
-                    "img[src*='lor001']",
-                    f"img[src*='{minifig_code}']",
-                    "img[alt*='minifig']",
-                    "img[alt*='LEGO']",
-                    ".minifig-image img",
-                    ".product-image img",
-                    "img"
-                ]
-                
-                for selector in image_selectors:
-                    try:
-                        images = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        for img in images:
-                            src = img.get_attribute("src")
-                            alt = img.get_attribute("alt") or ""
-                            
-                            if src and (
-                                "minifig" in src.lower() or 
-                                minifig_code.lower() in src.lower() or
-                                "minifig" in alt.lower() or
-                                (src.endswith(('.jpg', '.jpeg', '.png', '.webp')) and 
-                                 not any(skip in src.lower() for skip in ['logo', 'icon', 'banner', 'header']))
-                            ):
-                                print(f"   🖼️ Found image: {src}")
-                                path = self.img_db.download_image(minifig_code, src)
-                                if path:
-                                    data['image_path'] = path
-                                    data['has_image'] = True
-                                    break
-                        
-                        if data['has_image']:
-                            break
-                            
-                    except Exception as e:
-                        continue
+                # Look for images with various selectors (only one depends on the code)
+                image_selectors = _IMAGE_SELECTORS_HEAD + (f"img[src*='{minifig_code}']",) + _IMAGE_SELECTORS_TAIL
+                candidates = self.driver.execute_script(
+                    _IMAGE_CANDIDATES_JS, image_selectors, minifig_code, _IMAGE_SKIP_TERMS
+                )
+                for src in candidates:
+                    print(f"   🖼️ Found image: {src}")
+                    path = self.img_db.download_image(minifig_code, src)
+                    if path:
+                        data['image_path'] = path
+                        data['has_image'] = True
+                        break
                         
             except Exception as e:
                 print(f"   ⚠️ Error extracting image: {e}")
@@ -241,15 +305,18 @@ class EnhancedMinifigScraper:
                 sets = []
                 self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table.ctlsets-table")))
                 tables = self.driver.find_elements(By.CSS_SELECTOR, "table.ctlsets-table")
-                print(f"   📋 Found {len(tables)} tables")
+                if _VERBOSE:
+                    print(f"   📋 Found {len(tables)} tables")
                 for table in tables:
                     h4_tags = table.find_elements(By.CSS_SELECTOR, "h4")
-                    print(f"   📋 Found {len(h4_tags)} h4 tags in table")
+                    if _VERBOSE:
+                        print(f"   📋 Found {len(h4_tags)} h4 tags in table")
                     for h4 in h4_tags:
                         links = h4.find_elements(By.CSS_SELECTOR, "a[href^='/set/']")
                         for link in links:
                             set_title = link.get_attribute("innerText").strip()
-                            print(f"   📋 set title: '{set_title}'")
+                            if _VERBOSE:
+                                print(f"   📋 set title: '{set_title}'")
                             if set_title:
                                 sets.append(set_title)
                 data['sets'] = sets
@@ -275,37 +342,49 @@ class EnhancedMinifigScraper:
 
 def debug_dataframe(df):
     """Debug function to check DataFrame content"""
-    print("\n🔍 DEBUG: DataFrame Content")
-    print("=" * 50)
-    for idx, row in df.iterrows():
-        print(f"Row {idx}: {row['minifig_code']}")
-        print(f"  official_name: '{row['official_name']}'")
-        print(f"  has_image: {row['has_image']}")
-        print(f"  image_path: '{row['image_path']}'")
+    # Il report viene composto in memoria e scritto con una sola write
+    buf = StringIO()
+    buf.write("\n🔍 DEBUG: DataFrame Content\n" + "=" * 50 + "\n")
+    for idx, row in zip(df.index, df.to_dict('records')):
+        buf.write(f"Row {idx}: {row['minifig_code']}\n"
+                  f"  official_name: '{row['official_name']}'\n"
+                  f"  has_image: {row['has_image']}\n"
+                  f"  image_path: '{row['image_path']}'\n")
         if row['image_path']:
-            print(f"  path exists: {os.path.exists(row['image_path'])}")
-            if os.path.exists(row['image_path']):
-                print(f"  file size: {os.path.getsize(row['image_path'])} bytes")
-        print()
+            try:
+                size = os.stat(row['image_path']).st_size
+            except (OSError, TypeError, ValueError):
+                size = None
+            buf.write(f"  path exists: {size is not None}\n")
+            if size is not None:
+                buf.write(f"  file size: {size} bytes\n")
+        buf.write("\n")
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
 
 def create_minifig_database(minifig_codes, headless=True):
-    scraper = EnhancedMinifigScraper(headless=headless)
+    # Chrome viene avviato al primo codice da scaricare, non se sono già tutti presenti
+    scraper = None
     all_data = []
     # Carica i codici già presenti
     existing_codes = get_existing_minifig_codes()
-    for i, code in enumerate(minifig_codes, 1):
-        if code in existing_codes:
-            print(f"⏩ {code} già presente nel database, salto scraping.")
-            continue
-        print(f"\n🔎 {i}/{len(minifig_codes)}: Processing {code}")
-        data = scraper.extract_minifig_data(code)
-        all_data.append(data)
-        
-        # Add a small delay between requests to be respectful
-        if i < len(minifig_codes):
-            time.sleep(2)
-    
-    scraper.close()
+    try:
+        for i, code in enumerate(minifig_codes, 1):
+            if code in existing_codes:
+                print(f"⏩ {code} già presente nel database, salto scraping.")
+                continue
+            if scraper is None:
+                scraper = EnhancedMinifigScraper(headless=headless)
+            print(f"\n🔎 {i}/{len(minifig_codes)}: Processing {code}")
+            data = scraper.extract_minifig_data(code)
+            all_data.append(data)
+            
+            # Add a small delay between requests to be respectful
+            if i < len(minifig_codes):
+                time.sleep(2)
+    finally:
+        if scraper is not None:
+            scraper.close()
     if not all_data:
         print("ℹ️ Tutti i codici sono già presenti nel database. Carico i dati da SQLite.")
         conn = sqlite3.connect("lego_database/LegoDatabase.db")
@@ -324,6 +403,8 @@ def export_minifig_database(df, format='all'):
     if format in ['sqlite3', 'all']:
         sqlite_file = f"{base_filename}.db"
         conn = sqlite3.connect(sqlite_file)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
         cursor = conn.cursor()
         # Crea la tabella se non esiste
         cursor.execute("""
@@ -338,23 +419,24 @@ def export_minifig_database(df, format='all'):
                 sets TEXT
             )
         """)
-        # Inserisci solo i nuovi minifig (evita duplicati)
-        for _, row in df.iterrows():
-            cursor.execute("""
-                INSERT OR REPLACE INTO minifig (
-                    minifig_code, official_name, year, released,
-                    retail_price_gbp, has_image, image_path, sets
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                row['minifig_code'],
-                row['official_name'],
-                row['year'],
-                row['released'],
-                row['retail_price_gbp'],
-                int(row['has_image']),
-                row['image_path'],
-                ', '.join(row['sets']) if isinstance(row['sets'], list) else row['sets']
-            ))
+        # Nei DB creati da DatabaseManager has_image è una colonna generata
+        # (nascosta da pragma_table_info) e non si può scrivere
+        table_columns = {row[0] for row in cursor.execute("SELECT name FROM pragma_table_info('minifig')")}
+        columns = ['minifig_code', 'official_name', 'year', 'released',
+                   'retail_price_gbp', 'has_image', 'image_path', 'sets']
+        if 'has_image' not in table_columns:
+            columns.remove('has_image')
+        values = {
+            'has_image': df['has_image'].astype(int),
+            'sets': df['sets'].map(lambda sets: ', '.join(sets) if isinstance(sets, list) else sets)
+        }
+        # Inserisci solo i nuovi minifig (evita duplicati) - un solo executemany/commit
+        rows = zip(*(values.get(column, df.get(column)) for column in columns))
+        cursor.executemany(
+            f"INSERT OR REPLACE INTO minifig ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})",
+            rows
+        )
         conn.commit()
         
         output_files.append(sqlite_file)
@@ -383,7 +465,7 @@ def create_minifig_html_report(df: pd.DataFrame, filename: str):
     print(f"📁 HTML report directory: {html_dir}")
     print(f"🖼️ Images directory: {images_dir}")
     
-    html_content = """
+    html_parts = ["""
     <!DOCTYPE html>
     <html>
     <head>
@@ -414,14 +496,14 @@ def create_minifig_html_report(df: pd.DataFrame, filename: str):
         <a href="index.html" class="back-btn">⬅️ Back to Main Page</a>
         <div class="container">
             <h1>🧱 LEGO Minifigure Database Report</h1>
-    """
+    """]
     
     total = len(df)
-    found = len(df[(df['official_name'].notna()) & (df['official_name'] != 'Not found') & (df['official_name'] != 'Error')])
-    with_images = len(df[df['has_image'] == True])
-    errors = len(df[df['official_name'] == 'Error'])
+    found = int((df['official_name'].notna() & ~df['official_name'].isin(['Not found', 'Error'])).sum())
+    with_images = int((df['has_image'] == True).sum())
+    errors = int((df['official_name'] == 'Error').sum())
     
-    html_content += f"""
+    html_parts.append(f"""
             <div class="summary">
                 <h2>📊 Database Summary</h2>
                 <div class="stats">
@@ -444,9 +526,10 @@ def create_minifig_html_report(df: pd.DataFrame, filename: str):
                 </div>
             </div>
             <h2>🧑‍🚀 Minifigure Details</h2>
-    """
+    """)
     
-    for _, row in df.iterrows():
+    # to_dict('records') evita di costruire una Series per ogni riga come iterrows()
+    for row in df.to_dict('records'):
         sets = row['sets']
         if isinstance(sets, str):
             sets_list = [s.strip() for s in sets.split(',') if s.strip()]
@@ -464,14 +547,16 @@ def create_minifig_html_report(df: pd.DataFrame, filename: str):
         else:
             card_class = "minifig-card"
         
-        print(f"\n🔍 Processing HTML for {row['minifig_code']}:")
-        print(f"   has_image: {row['has_image']}")
-        print(f"   image_path: '{row['image_path']}'")
+        if _VERBOSE:
+            print(f"\n🔍 Processing HTML for {row['minifig_code']}:")
+            print(f"   has_image: {row['has_image']}")
+            print(f"   image_path: '{row['image_path']}'")
         
         # Handle image
         image_tag = ""
         if row['has_image'] and pd.notna(row['image_path']) and row['image_path'] and os.path.exists(str(row['image_path'])):
-            print(f"   ✅ Source image exists: {row['image_path']}")
+            if _VERBOSE:
+                print(f"   ✅ Source image exists: {row['image_path']}")
             image_filename = f"{row['minifig_code']}.jpg"
             dest_path = os.path.join(images_dir, image_filename)
             
@@ -481,16 +566,19 @@ def create_minifig_html_report(df: pd.DataFrame, filename: str):
                 dest_path = os.path.abspath(dest_path)
                 
                 #print(f"   📋 Copying: {source_path}")
-                print(f"   📋 To: {dest_path}")
+                if _VERBOSE:
+                    print(f"   📋 To: {dest_path}")
                 
                 # Copy image to HTML directory
                 #shutil.copy2(source_path, dest_path)
-                print(f"   ✅ Copy successful")
+                if _VERBOSE:
+                    print(f"   ✅ Copy successful")
                 
                 # Verify the copied file exists
                 if os.path.exists(dest_path):
                     file_size = os.path.getsize(dest_path)
-                    print(f"   ✅ Destination file exists, size: {file_size} bytes")
+                    if _VERBOSE:
+                        print(f"   ✅ Destination file exists, size: {file_size} bytes")
                     image_src = f"images/{image_filename}"
                     image_tag = f'<img src="{image_src}" class="minifig-image" alt="LEGO {row["minifig_code"]}">' 
                 else:
@@ -503,13 +591,14 @@ def create_minifig_html_report(df: pd.DataFrame, filename: str):
                 image_tag = f'<div class="minifig-image" style="display:flex;align-items:center;justify-content:center;color:#999;font-size:12px;">Copy Error: {type(e).__name__}</div>'
         else:
             # Debug info for missing images
-            print(f"   ❌ Image not available:")
-            if not row['has_image']:
-                print(f"      - has_image is False")
-            if not pd.notna(row['image_path']) or not row['image_path']:
-                print(f"      - image_path is empty or NaN")
-            elif not os.path.exists(str(row['image_path'])):
-                print(f"      - image_path doesn't exist: {row['image_path']}")
+            if _VERBOSE:
+                print(f"   ❌ Image not available:")
+                if not row['has_image']:
+                    print(f"      - has_image is False")
+                if not pd.notna(row['image_path']) or not row['image_path']:
+                    print(f"      - image_path is empty or NaN")
+                elif not os.path.exists(str(row['image_path'])):
+                    print(f"      - image_path doesn't exist: {row['image_path']}")
             image_tag = '<div class="minifig-image" style="display:flex;align-items:center;justify-content:center;color:#999;font-size:12px;">No Image</div>'
         
         # Handle name and details
@@ -523,7 +612,7 @@ def create_minifig_html_report(df: pd.DataFrame, filename: str):
         year = f"📅 {row['year']}" if pd.notna(row['year']) and row['year'] else ""
         price = f"💰 £{row['retail_price_gbp']}" if pd.notna(row['retail_price_gbp']) and row['retail_price_gbp'] else ""
         
-        html_content += f"""
+        html_parts.append(f"""
             <div class="{card_class}">
                 {image_tag}
                 <div class="minifig-info">
@@ -540,16 +629,16 @@ def create_minifig_html_report(df: pd.DataFrame, filename: str):
                     </div>
                 </div>
             </div>
-        """
+        """)
     
-    html_content += """
+    html_parts.append("""
         </div>
     </body>
     </html>
-    """
+    """)
     
     with open(filename, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+        f.write(''.join(html_parts))
 
 def get_existing_minifig_codes(sqlite_file="lego_database/LegoDatabase.db"):
     """Restituisce l'elenco dei minifig_code già presenti nel database"""
@@ -557,33 +646,29 @@ def get_existing_minifig_codes(sqlite_file="lego_database/LegoDatabase.db"):
         return set()
     conn = sqlite3.connect(sqlite_file)
     try:
-        df = pd.read_sql_query("SELECT minifig_code FROM minifig", conn)
-        return set(df['minifig_code'].tolist())
+        # Only the code column is needed: read it straight off the cursor
+        return {row[0] for row in conn.execute("SELECT minifig_code FROM minifig")}
     except Exception:
         return set()
     finally:
         conn.close()
 
+def parse_minifig_codes(codes_text):
+    """Split a comma-separated list of minifig codes, dropping blank and invalid entries"""
+    codes = (c.strip() for c in codes_text.split(','))
+    return [c for c in codes if _MINIFIG_CODE_RE.fullmatch(c)]
+
 def main():
     import sys
     print("🏗️ ENHANCED MINIFIG DATABASE CREATOR")
     print("Creates comprehensive minifig database with images")
     print("=" * 50)
 
-    # Codici ad-hoc (aggiungi qui quelli che vuoi in futuro)
-    extra_codes = [
-        "dim001", "dim007", "dim008"
-        # aggiungi altri codici qui
-    ]
-
-    # Range automatico lor001-lor153
-    auto_codes = [f"lor{str(i).zfill(3)}" for i in range(1, 154) if i != 108] # Skip lor108 as it's not a minifig
-
-    # Se passi codici da terminale, usali; altrimenti usa auto + extra
+    # Se passi codici da terminale, usali; altrimenti usa i codici di default
     if len(sys.argv) > 1:
-        codes = [c.strip() for c in sys.argv[1].split(',')]
+        codes = parse_minifig_codes(sys.argv[1])
     else:
-        codes = auto_codes + extra_codes
+        codes = list(_DEFAULT_MINIFIG_CODES)
         print(f"Using codes: {', '.join(codes)}")
 
     print(f"\n🏗️ CREATING MINIFIG DATABASE")
@@ -600,8 +685,8 @@ def main():
     files = export_minifig_database(df, format='all')
 
     elapsed = time.time() - start_time
-    found = len(df[(df['official_name'].notna()) & (df['official_name'] != 'Not found') & (df['official_name'] != 'Error')])
-    with_images = len(df[df['has_image'] == True])
+    found = int((df['official_name'].notna() & ~df['official_name'].isin(['Not found', 'Error'])).sum())
+    with_images = int((df['has_image'] == True).sum())
 
     print("\n" + "=" * 60)
     print(f"🎯 DATABASE CREATED in {elapsed:.1f} seconds")
@@ -2,9 +2,13 @@
 Data models for LEGO set information
 """
 from dataclasses import dataclass, asdict
+from functools import cached_property
 from typing import Optional, Dict, Any
 import re
 
+_NON_PRICE_CHARS = re.compile(r'[^\d.,]')
+_PRICE_FIELDS = frozenset(('retail_price_eur', 'retail_price_gbp', 'value_new_sealed', 'value_used'))
+
 @dataclass
 class LegoSetDetails:
     """Data class for LEGO set details"""
@@ -21,6 +25,12 @@ class LegoSetDetails:
     retail_price_eur: Optional[str] = None
     retail_price_gbp: Optional[str] = None
     
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        # The scraper fills prices after construction: drop the cached clean_prices
+        if name in _PRICE_FIELDS:
+            self.__dict__.pop('clean_prices', None)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
         return asdict(self)
@@ -31,7 +41,7 @@ class LegoSetDetails:
             return None
         
         # Remove currency symbols and extract numeric value
-        cleaned = re.sub(r'[^\d.,]', '', price_str)
+        cleaned = _NON_PRICE_CHARS.sub('', price_str)
         if not cleaned:
             return None
             
@@ -52,11 +62,16 @@ class LegoSetDetails:
         except ValueError:
             return None
     
-    def get_clean_prices(self) -> Dict[str, Optional[float]]:
-        """Get cleaned price values"""
+    @cached_property
+    def clean_prices(self) -> Dict[str, Optional[float]]:
+        """Cleaned price values, computed once per instance on first access"""
         return {
             'retail_price_eur': self.clean_price(self.retail_price_eur),
             'retail_price_gbp': self.clean_price(self.retail_price_gbp),
             'value_new_sealed': self.clean_price(self.value_new_sealed),
             'value_used': self.clean_price(self.value_used)
         }
+    
+    def get_clean_prices(self) -> Dict[str, Optional[float]]:
+        """Get cleaned price values (a copy of clean_prices, safe to modify)"""
+        return dict(self.clean_prices)
@@ -12,23 +12,46 @@ from logging_system import setup_logging, get_logger
 logger_system = setup_logging("ConnectionsPopulator")
 logger = get_logger(__name__)
 
-def extract_set_codes_from_names(sets_text, available_sets):
-    """Extract set codes from set names text"""
+_LEADING_NUMBER_RE = re.compile(r'^\d+\s+')
+_CODE_PREFIX_RE = re.compile(r'^(\d+)')
+
+class SetNameIndex:
+    """Lookup structures for matching set names to codes, built once per run"""
+    
+    def __init__(self, available_sets):
+        # Dictionary to map set names to codes
+        self.name_to_code = {}
+        for code, name in available_sets:
+            # Create multiple variations for matching
+            variations = [
+                name,
+                name.replace(" ", ""),
+                _LEADING_NUMBER_RE.sub('', name),  # Remove leading number
+                code  # Also try the code itself
+            ]
+            for variation in variations:
+                self.name_to_code[variation.lower()] = code
+        
+        # Known codes as a set for O(1) membership tests
+        self.available_codes = {code for code, _ in available_sets}
+    
+    def fuzzy_match(self, text):
+        """Return the code of the first name containing or contained in text"""
+        for name_key, code in self.name_to_code.items():
+            if text in name_key or name_key in text:
+                return code
+        return None
+
+def extract_set_codes_from_names(sets_text, available_sets, index=None):
+    """Extract set codes from set names text
+    
+    Pass a prebuilt SetNameIndex to avoid rebuilding it for every minifig.
+    """
     if not sets_text:
         return []
     
-    # Dictionary to map set names to codes
-    name_to_code = {}
-    for code, name in available_sets:
-        # Create multiple variations for matching
-        variations = [
-            name,
-            name.replace(" ", ""),
-            re.sub(r'^\d+\s+', '', name),  # Remove leading number
-            code  # Also try the code itself
-        ]
-        for variation in variations:
-            name_to_code[variation.lower()] = code
+    if index is None:
+        index = SetNameIndex(available_sets)
     
     found_codes = []
     set_names = [s.strip() for s in sets_text.split(',')]
@@ -37,23 +60,22 @@ def extract_set_codes_from_names(sets_text, available_sets):
         set_name_clean = set_name.strip()
         
         # Try exact match first
-        if set_name_clean.lower() in name_to_code:
-            found_codes.append(name_to_code[set_name_clean.lower()])
+        if set_name_clean.lower() in index.name_to_code:
+            found_codes.append(index.name_to_code[set_name_clean.lower()])
             continue
         
         # Try to extract set code from the beginning
-        code_match = re.match(r'^(\d+)', set_name_clean)
+        code_match = _CODE_PREFIX_RE.match(set_name_clean)
         if code_match:
             potential_code = code_match.group(1)
-            if potential_code in [code for code, _ in available_sets]:
+            if potential_code in index.available_codes:
                 found_codes.append(potential_code)
                 continue
         
         # Try fuzzy matching
-        for name_key, code in name_to_code.items():
-            if set_name_clean.lower() in name_key or name_key in set_name_clean.lower():
-                found_codes.append(code)
-                break
+        code = index.fuzzy_match(set_name_clean.lower())
+        if code is not None:
+            found_codes.append(code)
     
     return list(set(found_codes))  # Remove duplicates
 
@@ -77,9 +99,10 @@ def populate_connections():
         
         connections_created = 0
         connections_data = []
+        set_index = SetNameIndex(available_sets)
         
         for minifig_code, sets_text in minifigs_with_sets:
-            set_codes = extract_set_codes_from_names(sets_text, available_sets)
+            set_codes = extract_set_codes_from_names(sets_text, available_sets, set_index)
             
             for set_code in set_codes:
                 connections_data.append((set_code, minifig_code))